@@ -0,0 +1,281 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Forward-mode automatic differentiation with truncated multivariate Taylor numbers.
+  Derivatives are evaluated at points directly from the expression graph, the symbolic derivative is never built.
+'''
+
+import functools
+import itertools
+import math
+import numpy as np
+import sympy
+
+class TaylorAlgebra:
+    """
+    This class holds the bookkeeping of Taylor polynomials in 'm' variables truncated at total degree 'order':
+    the monomials (multi-indices) and, for multiplication, every pair of monomials whose product survives.
+    A Taylor number is an array of shape (M, N): one coefficient per monomial for each of N points.
+    """
+    def __init__(self, m, order):
+        """
+        Initialize the algebra for m variables up to the given total order.
+        """
+        self.m = m
+        self.order = order
+        self.monomials = [alpha for degree in range(order + 1)
+                          for alpha in itertools.product(range(degree + 1), repeat=m) if sum(alpha) == degree]
+        self.index = {alpha: i for i, alpha in enumerate(self.monomials)}
+
+        pairs = []
+        for a, alpha in enumerate(self.monomials):
+            for b, beta in enumerate(self.monomials):
+                gamma = tuple(i + j for i, j in zip(alpha, beta))
+                if sum(gamma) <= order:
+                    pairs.append((self.index[gamma], a, b))
+
+        # Sorted by target monomial so that a product is one gather and one np.add.reduceat
+        pairs.sort()
+        target, self.left, self.right = (np.array(column) for column in zip(*pairs))
+        self.starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def of(m, order):
+        """
+        Return the shared algebra for m variables and the given order.
+        """
+        return TaylorAlgebra(m, order)
+
+    def constant(self, value, n):
+        # A Taylor number with only a constant term
+        number = np.zeros((len(self.monomials), n))
+        number[0] = value
+        return number
+
+    def variable(self, k, value, n):
+        # The k-th seed variable: value + 1 * h_k
+        number = self.constant(value, n)
+        if self.order > 0:
+            unit = [0] * self.m
+            unit[k] = 1
+            number[self.index[tuple(unit)]] = 1.0
+        return number
+
+    def multiply(self, a, b):
+        """
+        Multiply two Taylor numbers, dropping every term above the truncation order.
+        """
+        return np.add.reduceat(a[self.left] * b[self.right], self.starts, axis=0)
+
+    def compose(self, a, derivatives):
+        """
+        Apply a scalar function to a Taylor number, given the (N,) arrays f(a0), f'(a0), ..., f^(order)(a0):
+        f(a0 + h) = sum_k f^(k)(a0) / k! * h^k where h = a - a0 is nilpotent.
+        """
+        h = a.copy()
+        h[0] = 0.0
+        result = self.constant(derivatives[0], a.shape[1])
+        power = None
+        for k in range(1, self.order + 1):
+            power = h if power is None else self.multiply(power, h)
+            result += derivatives[k] / math.factorial(k) * power
+        return result
+
+class ForwardModeAD:
+    """
+    This class evaluates partial derivatives of a sympy expression at many points at once by propagating
+    truncated Taylor numbers through the expression graph (each shared subexpression is evaluated once).
+    """
+    # Inverse functions: numpy value and derivative (an expression the Taylor arithmetic already handles)
+    INVERSE = {
+        sympy.atan: (np.arctan, lambda t: 1 / (1 + t**2)),
+        sympy.asin: (np.arcsin, lambda t: 1 / sympy.sqrt(1 - t**2)),
+        sympy.acos: (np.arccos, lambda t: -1 / sympy.sqrt(1 - t**2)),
+        sympy.asinh: (np.arcsinh, lambda t: 1 / sympy.sqrt(1 + t**2)),
+        sympy.acosh: (np.arccosh, lambda t: 1 / sympy.sqrt(t**2 - 1)),
+        sympy.atanh: (np.arctanh, lambda t: 1 / (1 - t**2)),
+    }
+
+    def __init__(self, expression, variables, order, chunk_size=2048):
+        """
+        Initialize with the expression, the variables to differentiate with respect to and the highest total order.
+        Points are processed 'chunk_size' at a time so the Taylor numbers stay in cache.
+        """
+        if not isinstance(order, int) or order < 0:
+            raise ValueError(f'''
+            Parameter - order supposed to be a non negative integer. But got {order}
+            ''')
+
+        self.expression = sympy.sympify(expression)
+        self.variables = list(variables)
+        self.algebra = TaylorAlgebra.of(len(self.variables), order)
+        self.chunk_size = chunk_size
+
+    def evaluate(self, values):
+        """
+        Propagate Taylor numbers for the point(s) in 'values' = {symbol or name: scalar or array}.
+        Returns the (M, N) Taylor number of the expression and the broadcast shape of the points.
+        """
+        arrays = {}
+        for s in self.expression.free_symbols | set(self.variables):
+            value = values.get(s, values.get(str(s)))
+            if value is None:
+                raise ValueError(f'''
+                No value was given for {s}
+                ''')
+            arrays[s] = np.asarray(value, dtype=float)
+
+        shape = np.broadcast_shapes(*(a.shape for a in arrays.values())) if arrays else ()
+        n = int(np.prod(shape))
+        flat = {s: np.broadcast_to(a, shape).reshape(n) for s, a in arrays.items()}
+
+        number = np.empty((len(self.algebra.monomials), n))
+        for start in range(0, max(n, 1), self.chunk_size):
+            chunk = {s: a[start:start + self.chunk_size] for s, a in flat.items()}
+            number[:, start:start + self.chunk_size] = self.propagate(chunk, min(self.chunk_size, n - start))
+
+        return number, shape
+
+    def propagate(self, flat, n):
+        # Walk the expression graph once for n points given as flat (n,) arrays
+        seeds = {v: self.algebra.variable(k, flat[v], n) for k, v in enumerate(self.variables)}
+        memo = {}
+
+        def walk(node):
+            if node in memo:
+                return memo[node]
+            if node in seeds:
+                result = seeds[node]
+            elif node.is_Symbol:
+                result = self.algebra.constant(flat[node], n)
+            elif node.is_number:
+                result = self.algebra.constant(float(node), n)
+            else:
+                # Numbers are kept as plain floats, they only ever scale or shift a Taylor number
+                result = self.apply(node, [float(arg) if arg.is_number else walk(arg) for arg in node.args], n)
+            memo[node] = result
+            return result
+
+        return walk(self.expression)
+
+    def apply(self, node, args, n):
+        # Propagate one operation of the expression graph
+        algebra = self.algebra
+        K = algebra.order
+
+        if node.is_Add:
+            result = algebra.constant(0.0, n)
+            for arg in args:
+                if isinstance(arg, float):
+                    result[0] += arg
+                else:
+                    result += arg
+            return result
+
+        if node.is_Mul:
+            scale = math.prod(arg for arg in args if isinstance(arg, float))
+            numbers = [arg for arg in args if not isinstance(arg, float)]
+            result = numbers[0]
+            for arg in numbers[1:]:
+                result = algebra.multiply(result, arg)
+            return result * scale
+
+        if node.is_Pow:
+            base, exponent = node.args
+            if base.is_number:
+                # c**b = exp(b * log(c))
+                return self.function(sympy.exp, args[1] * math.log(args[0]))
+            if exponent.is_Integer and abs(int(exponent)) <= 16:
+                # Exact repeated multiplication, also right for negative bases
+                p = abs(int(exponent))
+                result = args[0]
+                for _ in range(p - 1):
+                    result = algebra.multiply(result, args[0])
+                if p == 0:
+                    result = algebra.constant(1.0, n)
+                return result if int(exponent) >= 0 else self.reciprocal(result)
+            if exponent.is_number:
+                p = args[1]
+                a0 = args[0][0]
+                falling = [np.ones(n)]
+                for k in range(1, K + 1):
+                    falling.append(falling[-1] * (p - k + 1))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return algebra.compose(args[0], [falling[k] * a0 ** (p - k) for k in range(K + 1)])
+            # a**b = exp(b * log(a))
+            return self.function(sympy.exp, algebra.multiply(args[1], self.function(sympy.log, args[0])))
+
+        if len(args) == 1:
+            return self.function(node.func, args[0])
+
+        raise ValueError(f'''
+        Forward mode AD does not support the function {node.func.__name__}, use the symbolic backend
+        ''')
+
+    def reciprocal(self, a):
+        # 1 / a, the k-th derivative of 1/t is (-1)^k k! / t^(k+1)
+        a0 = a[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.algebra.compose(a, [(-1) ** k * math.factorial(k) / a0 ** (k + 1) for k in range(self.algebra.order + 1)])
+
+    def function(self, func, a):
+        # Elementary functions through their derivatives at the constant term
+        K = self.algebra.order
+        a0 = a[0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if func == sympy.exp:
+                value = np.exp(a0)
+                return self.algebra.compose(a, [value] * (K + 1))
+            if func == sympy.log:
+                return self.algebra.compose(a, [np.log(a0)] + [(-1) ** (k - 1) * math.factorial(k - 1) / a0 ** k
+                                                               for k in range(1, K + 1)])
+            if func == sympy.sin:
+                cycle = [np.sin(a0), np.cos(a0), -np.sin(a0), -np.cos(a0)]
+                return self.algebra.compose(a, [cycle[k % 4] for k in range(K + 1)])
+            if func == sympy.cos:
+                cycle = [np.cos(a0), -np.sin(a0), -np.cos(a0), np.sin(a0)]
+                return self.algebra.compose(a, [cycle[k % 4] for k in range(K + 1)])
+            if func == sympy.sinh:
+                cycle = [np.sinh(a0), np.cosh(a0)]
+                return self.algebra.compose(a, [cycle[k % 2] for k in range(K + 1)])
+            if func == sympy.cosh:
+                cycle = [np.cosh(a0), np.sinh(a0)]
+                return self.algebra.compose(a, [cycle[k % 2] for k in range(K + 1)])
+            if func == sympy.tan:
+                return self.algebra.multiply(self.function(sympy.sin, a), self.reciprocal(self.function(sympy.cos, a)))
+            if func == sympy.tanh:
+                return self.algebra.multiply(self.function(sympy.sinh, a), self.reciprocal(self.function(sympy.cosh, a)))
+            if func in self.INVERSE:
+                value, derivative = self.INVERSE[func]
+                return self.algebra.compose(a, self.through_derivative(value(a0), derivative, a0))
+            if func == sympy.Abs:
+                # |a| = sign(a0) * a away from zero, like sympy's derivative sign(x)
+                return a * np.sign(a0)
+            if func == sympy.sign:
+                return self.algebra.constant(np.sign(a0), a.shape[1])
+
+        raise ValueError(f'''
+        Forward mode AD does not support the function {func.__name__}, use the symbolic backend
+        ''')
+
+    def through_derivative(self, value, derivative, a0):
+        # f(a0), f'(a0), ..., f^(K)(a0) from the one variable Taylor series of f' around a0
+        K = self.algebra.order
+        derivatives = [value]
+        if K > 0:
+            t = sympy.Symbol("t")
+            series, _ = ForwardModeAD(derivative(t), [t], K - 1, self.chunk_size).evaluate({t: a0})
+            derivatives += [series[k - 1] * math.factorial(k - 1) for k in range(1, K + 1)]
+        return derivatives
+
+    def derivative(self, values, counts):
+        """
+        Return d^|counts| f / dv1^counts[0] dv2^counts[1] ... at the point(s) in 'values', shaped like the points.
+        """
+        number, shape = self.evaluate(values)
+        counts = tuple(counts)
+        scale = math.prod(math.factorial(c) for c in counts)
+        return (number[self.algebra.index[counts]] * scale).reshape(shape)
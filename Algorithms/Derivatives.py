@@ -0,0 +1,785 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  last updated - Nov 8, 2023
+'''
+
+import sympy
+import math
+import numpy as np
+import itertools
+from sympy.abc import x, y, z  # Importing symbolic variables for differentiation
+from sympy import pprint, Eq
+
+try:
+    # Imported as part of the Algorithms package
+    from .Profiling import profiler, diff, subs, solve, integrate
+    from .Simplification import simplify
+    from .Equations import Equation, EquationSolver, NewtonSolver
+    from . import Persistent_cache
+    from .Automatic_differentiation import ForwardModeAD
+    from .Kernels import evaluate_kernel, scipy_sparse
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Profiling import profiler, diff, subs, solve, integrate
+    from Simplification import simplify
+    from Equations import Equation, EquationSolver, NewtonSolver
+    import Persistent_cache
+    from Automatic_differentiation import ForwardModeAD
+    from Kernels import evaluate_kernel, scipy_sparse
+
+class DerivativeCache(Persistent_cache.LRUCache):
+    """
+    A size-bounded LRU cache of symbolic derivatives keyed on (expression, symbol, order).
+    One instance is shared by every class that differentiates through Differentiation.
+    """
+    def __init__(self, maxsize=2048):
+        """
+        Initialize an empty cache holding at most 'maxsize' derivatives.
+        """
+        super().__init__("diff", maxsize)
+
+    def derivative(self, expression, symbol, order=1):
+        """
+        Return the order-th derivative of the expression with respect to symbol, computing it only on a miss.
+        """
+        return self.get((expression, symbol, order), lambda: diff(expression, symbol, order))
+
+# Shared by Differentiation and therefore by FindGradient, TangentPlane, DirectionalDerivative, etc.
+derivative_cache = DerivativeCache()
+
+# Derivatives are attributed to the class that asked for them, not to the cache or the Differentiation wrapper
+profiler.transparent_classes.update({"DerivativeCache", "Differentiation"})
+
+class Differentiation:
+    """
+    This class is for performing symbolic differentiation on an expression with respect to a given symbol.
+    """
+    def __init__(self, expression, symbol):
+        """
+        Initialize the Differentiation object with an expression and symbol for differentiation.
+        """
+        # Ensure the symbol is a sympy Symbol object
+        if isinstance(symbol, sympy.core.symbol.Symbol):
+            symbol = sympy.symbols(str(symbol))
+
+        self.expression = expression
+        self.symbol = symbol
+
+    def forward_mode(self, symbols, values):
+        """
+        Evaluate the partial derivative along 'symbols' (like [x, x, y]) numerically with forward mode AD at 'values',
+        a dict {symbol or name: scalar or array} holding every variable of the expression. Vectorized over the arrays.
+        """
+        if not isinstance(values, dict) or not values:
+            raise ValueError('''
+            The "ad" backend needs the point(s) to evaluate at, like values={"x": 1, "y": [1, 2, 3]}
+            ''')
+
+        # By name, so that symbols with assumptions (like real=True) match the ones in the expression
+        names = {str(s): s for s in sympy.sympify(self.expression).free_symbols}
+        symbols = [names.get(str(s), sympy.Symbol(str(s))) for s in symbols]
+        variables = list(dict.fromkeys(symbols))
+        counts = [symbols.count(v) for v in variables]
+
+        return ForwardModeAD(self.expression, variables, len(symbols)).derivative(values, counts)
+
+    def differentiate(self, values=0, backend="symbolic"):
+        """
+        Perform differentiation on the expression. If values are provided, evaluate the derivative at those values.
+        backend="ad" evaluates the derivative at 'values' numerically without building it symbolically.
+        """
+        if backend == "ad":
+            return self.forward_mode([self.symbol], values)
+
+        try:
+            derivative = derivative_cache.derivative(self.expression, self.symbol)
+            if values:
+                try:
+                    return subs(derivative, values)
+                except:
+                    return derivative
+            return derivative
+        except Exception as e:
+            print("- Differentiation was not successful! ")
+            return e
+
+    def nth_differentiation(self, n, backend="symbolic", values=None):
+        """
+        Perform n-th order differentiation on the expression.
+        backend="ad" evaluates the n-th derivative at 'values' numerically without building it symbolically.
+        """
+        if not isinstance(n, int) and n > 0:
+            raise TypeError(f'''
+            Wrong value for n, n supposed to be an integer and should be > 0
+            ''')
+
+        if backend == "ad":
+            return self.forward_mode([self.symbol] * n, values)
+
+        # One order at a time through the shared cache, so every intermediate order is reusable
+        derivative = self.expression
+        for _ in range(n):
+            derivative = derivative_cache.derivative(derivative, self.symbol)
+            if derivative == 0:
+                return 0
+
+        return derivative
+
+    def mixed_partial_differentiation(self, order_of_symbols, backend="symbolic", values=None):
+        """
+        Perform mixed partial differentiation on the expression based on the order of symbols provided.
+        backend="ad" evaluates the mixed partial at 'values' numerically without building it symbolically.
+        """
+        if not isinstance(order_of_symbols, list) and order_of_symbols < 1:
+            raise TypeError('''
+            Order of symbols needs to be in list form - like -> [x,y,z] and length should be greater than 1.
+            ''')
+
+        if not all(isinstance(i, sympy.core.symbol.Symbol) for i in order_of_symbols):
+            raise TypeError(f'''
+            All variables should be the instance of sympy.core.symbol.Symbol but got {type(order_of_symbols[0])} 
+            ''')
+
+        if backend == "ad":
+            return self.forward_mode(order_of_symbols, values)
+
+        derivative = self.expression
+        for symbol in order_of_symbols:
+            derivative = derivative_cache.derivative(derivative, symbol)
+            if derivative == 0:
+                return 0
+
+        return derivative
+
+class TaylorExpansion:
+    """
+    This class builds the multivariate Taylor expansion of an expression up to total order 'order' around 'point'.
+    Each mixed partial is differentiated once from its parent one order lower and kept in a shared derivative table,
+    the expansion can then be evaluated as a polynomial surrogate at many nearby points at once.
+    """
+    def __init__(self, expression, point, order=2, variables=None):
+        """
+        Initialize with an expression, the point to expand around {symbol or name: value}, the total order and
+        the variables to expand in (default: the keys of the point).
+        """
+        if not isinstance(point, dict):
+            raise TypeError(f'''
+            Parameter - point got wrong data type supposed to be a dict. But got {type(point)}
+            ''')
+
+        if not isinstance(order, int) or order < 0:
+            raise ValueError(f'''
+            Parameter - order supposed to be a non negative integer. But got {order}
+            ''')
+
+        self.expression = sympy.sympify(expression)
+        self.point = {sympy.Symbol(str(k)): sympy.sympify(v) for k, v in point.items()}
+        self.order = order
+        self.variables = [sympy.Symbol(str(v)) for v in (variables or self.point)]
+        self.m = len(self.variables)
+
+        # Multi-indices by increasing total order, the same layout as the Taylor numbers of ForwardModeAD
+        self.monomials = [alpha for degree in range(order + 1)
+                          for alpha in itertools.product(range(degree + 1), repeat=self.m) if sum(alpha) == degree]
+        self._table = None
+        self._coefficients = None
+
+    def derivatives(self):
+        """
+        Return the derivative table {multi-index: mixed partial}. Each entry is one differentiation of an entry
+        one order lower, and goes through the shared derivative_cache.
+        """
+        if self._table is None:
+            table = {self.monomials[0]: self.expression}
+            for alpha in self.monomials[1:]:
+                i = next(k for k, a in enumerate(alpha) if a)
+                parent = alpha[:i] + (alpha[i] - 1,) + alpha[i + 1:]
+                table[alpha] = derivative_cache.derivative(table[parent], self.variables[i]) if table[parent] != 0 else 0
+            self._table = table
+
+        return self._table
+
+    def coefficients(self):
+        """
+        Return the Taylor coefficients {multi-index: D^alpha f(point) / alpha!}.
+        """
+        if self._coefficients is None:
+            table = self.derivatives()
+            self._coefficients = {alpha: subs(sympy.sympify(table[alpha]), self.point) / math.prod(math.factorial(a) for a in alpha)
+                                  for alpha in self.monomials}
+
+        return self._coefficients
+
+    def polynomial(self):
+        """
+        Return the expansion as a sympy polynomial in the variables.
+        """
+        return sum(c * math.prod((v - self.point.get(v, 0)) ** a for v, a in zip(self.variables, alpha))
+                   for alpha, c in self.coefficients().items())
+
+    def compile(self):
+        """
+        Return the numeric coefficients, the exponents (M, m) and the expansion point (m,) as arrays.
+        """
+        try:
+            coefficients = np.array([float(c) for c in self.coefficients().values()])
+            center = np.array([float(self.point[v]) for v in self.variables])
+        except (TypeError, KeyError):
+            raise ValueError(f'''
+            The expansion can only be evaluated numerically at a numeric point that sets every symbol of {self.expression}
+            ''')
+
+        return coefficients, np.array(self.monomials, dtype=int).reshape(-1, self.m), center
+
+    def __call__(self, points):
+        """
+        Evaluate the expansion at many points, given as an (N, m) array in the order of the variables
+        or as a dict {symbol or name: array}. Returns an array shaped like the points.
+        """
+        if not hasattr(self, "_compiled"):
+            self._compiled = self.compile()
+        coefficients, exponents, center = self._compiled
+
+        if isinstance(points, dict):
+            columns = [np.asarray(points.get(v, points.get(str(v))), dtype=float) for v in self.variables]
+            shape = np.broadcast_shapes(*(c.shape for c in columns))
+            delta = np.stack([np.broadcast_to(c, shape).ravel() for c in columns], axis=1) - center
+        else:
+            points = np.asarray(points, dtype=float)
+            shape = points.shape[:-1]
+            delta = points.reshape(-1, self.m) - center
+
+        # powers[i][k] = delta_i ** k, then every monomial is a product of m gathered rows
+        powers = [np.vander(delta[:, i], self.order + 1, increasing=True).T for i in range(self.m)]
+        values = np.ones((len(exponents), len(delta)))
+        for i in range(self.m):
+            values *= powers[i][exponents[:, i]]
+
+        return (coefficients @ values).reshape(shape)
+
+
+class Second_derivative_test:
+    """
+    This class is used to perform the second derivative test to classify critical points.
+    """
+    def __init__(self, expression, critical_points=None, variables=None):
+        """
+        Initialize the Second_derivative_test object with an expression and critical points.
+        With an ordered list of 'variables' the test runs in any number of variables on the sparse Hessian.
+        """
+        if not all(isinstance(i, dict) for i in critical_points) and not isinstance(critical_points, list):
+            raise TypeError('Type Error critical point should look like -> [{"x":1,"y":2}]')
+
+        if len(critical_points) == 0:
+            raise ValueError(f"Got empty critical points. Critical points are needed to execute this code.")
+
+        self.expression = expression
+        self.ck_p = critical_points
+        self.variables = variables
+
+    def __call__(self, *args, **kwargs):
+        """
+        Execute the second derivative test when the object is called.
+        With variables, every label maps to the list of critical points that carry it (from the Hessian eigenvalues).
+        """
+        value = {"local_min": {}, "local_max": {}, "saddle_point": {}, "inclusive_point": {}}
+
+        if self.variables:
+            labels = HessianTest(self.expression, self.variables)(self.ck_p)["labels"]
+            return {label: [p for p, l in zip(self.ck_p, labels) if l == label] for label in value}
+
+        try:
+            for i in self.ck_p:
+                # Based on the second derivative test, classify the critical points
+                if (subs(self.Fxx(), i) > 0 and subs(self.determinant(), i) > 0):
+                    value["local_min"] = self.ck_p
+
+                elif (subs(self.Fxx(), i) < 0 and subs(self.determinant(), i) > 0):
+                    value["local_max"] = self.ck_p
+
+                elif (subs(self.determinant(), i) < 0):
+                    value["saddle_point"] = self.ck_p
+
+                elif(subs(self.determinant(), i) == 0):
+                    value["inclusive_point"] = self.ck_p
+
+                else:
+                    print('''
+                    Got Unexpected Answer. Function not successful...
+                    ''')
+                    return
+
+                return value
+
+        except:
+            print('''
+            Got Unexpected Answer. Function not successful.
+            More code is needed to get the answer. Thanks
+            ''')
+            return
+
+    def Fxx(self):
+        """
+        Calculate the second partial derivative with respect to x.
+        """
+        diff = Differentiation(self.expression, x)
+
+        try:
+            return simplify(diff.nth_differentiation(2))
+        except:
+            return diff.nth_differentiation(2)
+
+    def Fxy(self):
+        """
+        Calculate the mixed second partial derivative with respect to x and y.
+        """
+        diff = Differentiation(self.expression, x)
+
+        fxx = diff.differentiate()
+
+        fxy = Differentiation(fxx, y)
+
+        try:
+            return simplify(fxy.differentiate())
+        except:
+            return fxy.differentiate()
+
+    def Fyy(self):
+        """
+        Calculate the second partial derivative with respect to y.
+        """
+        diff = Differentiation(self.expression, y)
+
+        try:
+            return simplify(diff.nth_differentiation(2))
+        except:
+            return diff.nth_differentiation(2)
+
+    def determinant(self):
+        """
+        Calculate the determinant of the Hessian matrix.
+        """
+        try:
+            return simplify(self.Fxx() * self.Fyy() - (self.Fxy()) ** 2)
+        except:
+            return self.Fxx() * self.Fyy() - (self.Fxy()) ** 2
+
+class SparseDerivatives:
+    """
+    This class differentiates an expression in many variables through the structural sparsity of its gradient and
+    Hessian, read from the expression graph. The top-level terms of a sum are grouped by the variables they contain,
+    a gradient entry only differentiates the terms that contain its variable, and a Hessian entry (i, j) is only
+    formed when variable j occurs in gradient entry i. A separable model in n variables costs O(n), not O(n^2).
+    """
+    def __init__(self, expression, variables=None):
+        """
+        Initialize with an expression and the ordered list of variables (defaults to its free symbols sorted by name).
+        """
+        self.expression = sympy.sympify(expression)
+        self.variables = list(variables) if variables else sorted(self.expression.free_symbols, key=str)
+        self.index = {v: i for i, v in enumerate(self.variables)}
+        self._gradient = None
+        self._hessian = None
+        self._kernels = {}
+
+    def terms(self):
+        """
+        Return {variable index: sum of the top-level terms of the expression that contain that variable}.
+        """
+        groups = {}
+        for term in sympy.Add.make_args(self.expression):
+            for v in term.free_symbols:
+                if v in self.index:
+                    groups.setdefault(self.index[v], []).append(term)
+
+        return {i: sympy.Add(*terms) for i, terms in groups.items()}
+
+    def gradient(self):
+        """
+        Return the nonzero gradient entries {i: df/dv_i}.
+        """
+        if self._gradient is None:
+            gradient = {}
+            for i, part in sorted(self.terms().items()):
+                derivative = derivative_cache.derivative(part, self.variables[i])
+                if derivative != 0:
+                    gradient[i] = derivative
+            self._gradient = gradient
+
+        return self._gradient
+
+    def hessian(self):
+        """
+        Return the nonzero Hessian entries {(i, j): d2f/dv_i dv_j}, both triangles sharing the same expressions.
+        """
+        if self._hessian is None:
+            hessian = {}
+            for i, first in self.gradient().items():
+                for v in first.free_symbols:
+                    j = self.index.get(v)
+                    if j is None or j < i:
+                        continue
+                    derivative = derivative_cache.derivative(first, v)
+                    if derivative != 0:
+                        hessian[i, j] = hessian[j, i] = derivative
+            self._hessian = hessian
+
+        return self._hessian
+
+    def upper(self):
+        # Nonzero Hessian positions with i <= j, row-major
+        return sorted(k for k in self.hessian() if k[0] <= k[1])
+
+    def gradient_matrix(self, point=None):
+        """
+        Return the gradient as an n x 1 sympy SparseMatrix, evaluated at 'point' if given.
+        """
+        entries = {(i, 0): subs(e, point) if point else e for i, e in self.gradient().items()}
+        return sympy.SparseMatrix(len(self.variables), 1, entries)
+
+    def hessian_matrix(self, point=None):
+        """
+        Return the Hessian as an n x n sympy SparseMatrix, evaluated at 'point' if given.
+        """
+        entries = {k: subs(e, point) if point else e for k, e in self.hessian().items()}
+        return sympy.SparseMatrix(len(self.variables), len(self.variables), entries)
+
+    def compile(self, hessian=False):
+        """
+        Compile the nonzero gradient entries, and with 'hessian' the nonzero upper Hessian entries, into one kernel.
+        """
+        if hessian not in self._kernels:
+            outputs = list(self.gradient().values())
+            if hessian:
+                outputs += [self.hessian()[k] for k in self.upper()]
+            self._kernels[hessian] = sympy.lambdify(self.variables, outputs, modules='numpy', cse=True)
+
+        return self._kernels[hessian]
+
+    def evaluate(self, points, hessian=False):
+        """
+        Evaluate at an (S, n) array of points. Returns {"gradient": (S, n) array} and with 'hessian' also
+        "hessian": a list of S scipy.sparse.csr_matrix (dense (n, n) arrays if scipy is not installed).
+        """
+        points = np.asarray(points, dtype=float)
+        n = len(self.variables)
+        if points.ndim != 2 or points.shape[1] != n:
+            raise ValueError(f'''
+            Parameter - points supposed to be an array of shape (S, {n}). But got {points.shape}
+            ''')
+
+        S = points.shape[0]
+        nonzero = list(self.gradient())
+        upper = self.upper() if hessian else []
+        outputs = evaluate_kernel(self.compile(hessian), points, len(nonzero) + len(upper))
+
+        gradient = np.zeros((S, n))
+        gradient[:, nonzero] = outputs[:, :len(nonzero)]
+
+        result = {"gradient": gradient}
+        if not hessian:
+            return result
+
+        values = outputs[:, len(nonzero):]
+
+        # Mirror the strict upper triangle
+        rows = np.array([i for i, j in upper] + [j for i, j in upper if i != j], dtype=int)
+        columns = np.array([j for i, j in upper] + [i for i, j in upper if i != j], dtype=int)
+        off = np.array([i != j for i, j in upper], dtype=bool)
+        values = np.concatenate([values, values[:, off]], axis=1)
+
+        scipy = scipy_sparse()
+        if scipy is not None:
+            result["hessian"] = [scipy[0].csr_matrix((values[s], (rows, columns)), shape=(n, n)) for s in range(S)]
+        else:
+            dense = np.zeros((S, n, n))
+            dense[:, rows, columns] = values
+            result["hessian"] = list(dense)
+
+        return result
+
+class HessianTest:
+    """
+    This class classifies a batch of critical points of an expression in any number of variables
+    from the eigenvalues of its Hessian matrix.
+    """
+    LABELS = np.array(["local_min", "local_max", "saddle_point", "inclusive_point"])
+
+    def __init__(self, expression, variables=None, tolerance=1e-9):
+        """
+        Initialize with an expression and the ordered list of variables (defaults to its free symbols sorted by name).
+        Eigenvalues whose magnitude is below 'tolerance' are treated as zero.
+        """
+        if variables is None:
+            variables = sorted(sympy.sympify(expression).free_symbols, key=str)
+
+        if not isinstance(variables, (list, tuple)) or len(variables) == 0:
+            raise TypeError('''
+            Variables need to be in list form - like -> [x,y,z] and length should be greater than 0.
+            ''')
+
+        self.expression = expression
+        self.variables = list(variables)
+        self.tolerance = tolerance
+        self.matrix = None
+        self.kernel = None
+
+    def hessian(self):
+        """
+        Build the symbolic Hessian matrix once, differentiating only its structurally nonzero entries.
+        """
+        if self.matrix is None:
+            self.derivatives = SparseDerivatives(self.expression, self.variables)
+            n = len(self.variables)
+            self.matrix = sympy.Matrix(sympy.SparseMatrix(n, n, self.derivatives.hessian()))
+
+        return self.matrix
+
+    def compile(self):
+        """
+        Compile the nonzero entries of the upper triangle of the Hessian into a single vectorized numeric kernel.
+        """
+        if self.kernel is None:
+            self.hessian()
+            self.entries = self.derivatives.upper()
+            hessian = self.derivatives.hessian()
+            self.kernel = sympy.lambdify(self.variables, [hessian[k] for k in self.entries], modules='numpy', cse=True)
+
+        return self.kernel
+
+    def as_array(self, critical_points):
+        """
+        Convert critical points given as an (N, n) array or as a list of dicts (like [{"x":1,"y":2}]) into an (N, n) array.
+        """
+        if isinstance(critical_points, list) and all(isinstance(i, dict) for i in critical_points):
+            critical_points = [
+                [point[v] if v in point else point[str(v)] for v in self.variables] for point in critical_points
+            ]
+
+        points = np.asarray(critical_points, dtype=float)
+
+        if points.ndim != 2 or points.shape[1] != len(self.variables):
+            raise ValueError(f'''
+            Critical points supposed to be an array of shape (N, {len(self.variables)}). But got {points.shape}
+            ''')
+
+        return points
+
+    def evaluate(self, critical_points):
+        """
+        Evaluate the Hessian at every critical point and return an (N, n, n) array.
+        """
+        points = self.as_array(critical_points)
+        n = len(self.variables)
+
+        kernel = self.compile()
+        values = evaluate_kernel(kernel, points, len(self.entries))
+        hessians = np.zeros((points.shape[0], n, n), dtype=float)
+        if self.entries:
+            rows, columns = (np.array(index) for index in zip(*self.entries))
+            hessians[:, rows, columns] = values
+            hessians[:, columns, rows] = values
+
+        return hessians
+
+    def __call__(self, critical_points):
+        """
+        Classify the critical points in one pass. Returns the per-point labels and eigenvalues as arrays,
+        and for every label the indices of the points that carry it.
+        """
+        eigenvalues = np.linalg.eigvalsh(self.evaluate(critical_points))
+
+        positive = np.all(eigenvalues > self.tolerance, axis=1)
+        negative = np.all(eigenvalues < -self.tolerance, axis=1)
+        saddle = np.any(eigenvalues > self.tolerance, axis=1) & np.any(eigenvalues < -self.tolerance, axis=1)
+
+        codes = np.select([positive, negative, saddle], [0, 1, 2], default=3)
+
+        value = {"labels": self.LABELS[codes], "eigenvalues": eigenvalues}
+        for code, label in enumerate(self.LABELS):
+            value[str(label)] = np.flatnonzero(codes == code)
+
+        return value
+
+class Absolute_Values:
+    """
+    This class finds the absolute maximum and minimum values of an expression over a set of critical points.
+    """
+
+    def __init__(self, expression, critical_points):
+        """
+        Initialize the Absolute_Values object with an expression and critical points.
+        """
+        if not all(isinstance(i, dict) for i in critical_points) and not isinstance(critical_points, list):
+            raise TypeError('Type Error critical point should look like -> [{"x":1,"y":2}]')
+
+        if len(critical_points) == 0:
+            raise ValueError(f"Got empty critical points. Critical points are needed to execute this code.")
+
+        self.expression = expression
+        self.ck_points = critical_points
+
+    def __call__(self):
+        """
+        Execute the process to find absolute maxima and minima when the object is called.
+        """
+        extreme_values = {'absolute_max': {}, 'absolute_min': {}}
+
+        maximum = -math.inf
+        minimum = math.inf
+
+        for i in self.ck_points:
+            val = simplify(subs(self.expression, i)) if not isinstance(self.expression,
+                                                                      (int, float)) else self.expression
+
+            if val > maximum:
+                maximum = val
+                extreme_values['absolute_max'] = maximum
+
+            if val <= minimum:
+                minimum = val
+                extreme_values['absolute_min'] = minimum
+
+        return extreme_values
+
+class FindCriticalPoints:
+    """
+    This class is used to find the critical points of an expression.
+    """
+    # Above this many gradient equations the linear systems of 'variables' models are solved numerically
+    SPARSE_SIZE = 64
+
+    def __init__(self, expression, point=None, variables=None):
+        """
+        Initialize the FindCriticalPoints object with an expression and optionally a specific point.
+        'variables' (an ordered list of symbols) replaces the default x, y, z for models in any number of variables.
+        """
+        if point:
+            if not isinstance(point, dict):
+                raise TypeError(f'''
+                Parameter - point got wrong data type supposed to be a dict. But got {type(point)}
+                ''')
+
+        self.expression = expression
+        self.point = point
+        self.variables = list(variables) if variables else None
+
+    def __call__(self, *args, method="symbolic", bounds=None, seeds=1000, grid=False, seed=None, **kwargs):
+        """
+        Execute the process to find critical points when the object is called.
+        With method="numeric" the gradient system is solved by multi-start damped Newton instead of symbolic solve:
+        'seeds' starting points (random, or a grid if 'grid' is True) are drawn in the box 'bounds' = {"x": (-10, 10), ...}
+        and the distinct roots inside that box are returned in the same list-of-dicts format.
+        For 'variables' models the remaining keyword arguments (numeric, sparse, time_limit, ...) are passed on
+        to EquationSolver, numeric=True and sparse=True are the default above SPARSE_SIZE equations.
+        """
+        if method == "numeric":
+            return self.numeric(bounds, seeds, grid, seed, **kwargs)
+
+        if self.variables:
+            # Only the structurally nonzero gradient entries give equations
+            gradient = SparseDerivatives(self.expression, self.variables).gradient()
+            equations = [Equation(Eq(gradient[i], 0)) for i in sorted(gradient)]
+            if not equations:
+                return []
+
+            # Exact elimination does not scale to large models, their linear systems are solved sparse in floats
+            options = {"numeric": True, "sparse": True} if len(equations) > self.SPARSE_SIZE else {}
+            options.update(kwargs)
+            return EquationSolver(equations, [self.variables[i] for i in sorted(gradient)])(*args, **options)
+
+        # Find the partial derivatives with respect to x, y, and z
+        f_x = Differentiation(self.expression, x).differentiate()
+        f_y = Differentiation(self.expression, y).differentiate()
+        f_z = Differentiation(self.expression, z).differentiate()
+
+        # Equate the partial derivatives to zero to find critical points
+        e1 = Eq(f_x, 0) if f_x != 0 else None
+        e2 = Eq(f_y, 0) if f_y != 0 else None
+        e3 = Eq(f_z, 0) if f_z != 0 else None
+
+        try:
+            # Solve the system of equations to find the critical points
+            l = [Equation(e) for e in (e1, e2, e3) if e != None]
+
+            critical_points = EquationSolver(l)()
+
+            return critical_points
+
+        except:
+            print("Something went wrong during the execution with Equation Class")
+            raise Exception
+
+    def numeric(self, bounds=None, seeds=1000, grid=False, seed=None, **options):
+        """
+        Find the critical points with NewtonSolver over the compiled gradient and its Jacobian (the Hessian),
+        both built from their structurally nonzero entries only.
+        """
+        derivatives = SparseDerivatives(self.expression, self.variables or [v for v in (x, y, z) if v in sympy.sympify(self.expression).free_symbols])
+        gradient = derivatives.gradient()
+        if not gradient:
+            return []
+
+        # Variables the gradient does not depend on are left out of the system
+        position = {i: k for k, i in enumerate(sorted(gradient))}
+        variables = [derivatives.variables[i] for i in position]
+        jacobian = {(position[i], position[j]): e for (i, j), e in derivatives.hessian().items() if j in position}
+
+        bounds = bounds or {}
+        box = [bounds.get(str(v), bounds.get(v, (-10, 10))) for v in variables]
+
+        solver = NewtonSolver([gradient[i] for i in position], variables, jacobian=jacobian, **options)
+        roots = solver.inside(solver(solver.seeds(box, seeds, grid, seed)), box)
+
+        return [dict(zip(variables, map(float, root))) for root in roots]
+
+if __name__ == "__main__":
+    # Example usage of the classes defined above
+    expression = 140 * x + 180 * y - 3 * x ** 2 - 2 * y ** 2 - x * y
+
+    # Find critical points for the given expression
+    critical_points = FindCriticalPoints(expression)()
+    pprint(critical_points)
+
+    # Find the derivative with respect to y
+    pprint(Differentiation(expression, y).differentiate())
+
+    # Find absolute values at the critical points
+    absolute_values = Absolute_Values(expression, critical_points)()
+    #
+    local = Second_derivative_test(expression, critical_points)()
+    #
+    print(local)
+
+    # Classify many critical points at once from the eigenvalues of the Hessian
+    pprint(HessianTest(expression, [x, y])(critical_points)["labels"])
+
+    # Critical points of a transcendental surface with multi-start Newton
+    pprint(FindCriticalPoints(sympy.sin(x) * sympy.cos(y) + x**2 / 10)(method="numeric", bounds={"x": (-4, 4), "y": (-4, 4)}, seed=0))
+
+    # A chained model in 50 variables: only the 50 + 2 * 49 structurally nonzero Hessian entries are differentiated
+    v = sympy.symbols("v0:50")
+    chain = sum((a - 1)**4 + a * b for a, b in zip(v, v[1:])) + (v[-1] - 1)**4
+    print(len(SparseDerivatives(chain, v).hessian()), SparseDerivatives(chain, v).hessian_matrix().shape)
+    pprint(FindCriticalPoints(sum((a - 1)**2 + a * b / 4 for a, b in zip(v[:3], v[1:3])), variables=v[:3])())
+
+    # Fourth order mixed partial at many points by forward mode AD, the symbolic derivative is never built
+    surface = sympy.exp(sympy.sin(x * y)) * sympy.log(1 + x**2)
+    points = {"x": np.linspace(0.1, 2, 5), "y": 1.5}
+    print(Differentiation(surface, x).mixed_partial_differentiation([x, x, y, y], backend="ad", values=points))
+
+    # Third order Taylor surrogate of the same surface around (1, 1), evaluated at nearby points
+    expansion = TaylorExpansion(surface, {"x": 1, "y": 1}, order=3)
+    pprint(expansion.polynomial())
+    print(expansion(np.array([[1.05, 0.95], [0.9, 1.1]])), [float(surface.subs({x: 1.05, y: 0.95})), float(surface.subs({x: 0.9, y: 1.1}))])
+
+    # Where does the symbolic time go? Profile one second derivative test
+    with profiler:
+        Second_derivative_test(expression, critical_points)()
+    print(profiler.table())
+
+    # Repeated derivatives of the same surface are served from the shared cache
+    print(derivative_cache.stats())
+
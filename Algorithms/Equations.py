@@ -5,10 +5,28 @@
   last updated - Nov 8, 2023
 '''
 
-from sympy import simplify
+import sympy
 import math
+import warnings
+import numpy as np
 from sympy.abc import x, y, z
-from sympy import pprint, Eq, solve, integrate
+from sympy import pprint, Eq
+from sympy.polys.matrices.exceptions import DMNonInvertibleMatrixError
+
+try:
+    # Imported as part of the Algorithms package
+    from .Profiling import solve, integrate
+    from .Simplification import simplify
+    from .Supervisor import supervise, SupervisionError
+    from . import Persistent_cache
+    from .Kernels import evaluate_kernel, scipy_sparse
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Profiling import solve, integrate
+    from Simplification import simplify
+    from Supervisor import supervise, SupervisionError
+    import Persistent_cache
+    from Kernels import evaluate_kernel, scipy_sparse
 
 '''
 Why we need this class. 
@@ -51,9 +69,10 @@ class EquationSolver:
     """
     This class solves a system of equations provided as a list of Equation instances.
     """
-    def __init__(self, equations_list):
+    def __init__(self, equations_list, variables=None):
         """
-        Initialize the EquationSolver with a list of Equation objects.
+        Initialize the EquationSolver with a list of Equation objects and optionally the ordered list of variables
+        to solve for (default: x, y, z). With explicit variables every solution is a dict keyed by them.
         """
         if not isinstance(equations_list, list) and all(isinstance(i, Equation) for i in equations_list):
             raise ValueError('''
@@ -61,24 +80,129 @@ class EquationSolver:
             ''')
 
         self.eq_list = equations_list
+        self.variables = list(variables) if variables else None
+        self.symbols = tuple(self.variables or (x, y, z))
         # Find the highest order of the equations in the list
         self.highest_order = max([eq.no_of_vars for eq in equations_list])
 
-    def __call__(self, *args, **kwargs):
+    def linear_system(self):
+        """
+        Return (A, b, variables) if every equation is linear in the variables with numeric coefficients
+        and the system is square, otherwise None.
+        """
+        equations = [i().lhs - i().rhs for i in self.eq_list]
+        free = set().union(*(e.free_symbols for e in equations))
+        variables = [v for v in self.symbols if v in free]
+
+        if not variables or len(variables) != len(equations) or free - set(variables):
+            return None
+
+        try:
+            A, b = sympy.linear_eq_to_matrix(equations, variables)
+        except ValueError:
+            # sympy raises NonlinearError (a ValueError) as soon as one equation is not linear
+            return None
+
+        return A, b, variables
+
+    def solve_linear(self, system, numeric=False, sparse=False):
+        """
+        Solve a square linear system in matrix form. Exact rational elimination by default, or a dense/sparse
+        floating point solve when 'numeric' is True. Returns None if the matrix is singular.
+        """
+        A, b, variables = system
+
+        if numeric:
+            scipy = scipy_sparse() if sparse else None
+
+            if scipy is not None:
+                sparse_module, linalg = scipy
+                solution = linalg.spsolve(sparse_module.csr_matrix(np.array(A, dtype=float)), np.array(b, dtype=float).ravel())
+            else:
+                try:
+                    solution = np.linalg.solve(np.array(A, dtype=float), np.array(b, dtype=float).ravel())
+                except np.linalg.LinAlgError:
+                    return None
+            if not np.all(np.isfinite(solution)):
+                return None
+            return dict(zip(variables, map(float, np.atleast_1d(solution))))
+
+        # LU over the coefficient field (QQ for rational systems) with DomainMatrix is
+        # far faster than Matrix.LUsolve, and a singular matrix is reported by the solve itself
+        A, b = A.to_DM().unify(b.to_DM())
+        try:
+            solution = A.to_field().lu_solve(b.to_field())
+        except DMNonInvertibleMatrixError:
+            return None
+
+        return dict(zip(variables, solution.to_Matrix()))
+
+    def numeric(self, bounds=None, seeds=1000, seed=None, **options):
+        """
+        Solve the system with multi-start NewtonSolver, seeds are drawn in 'bounds' = {"x": (-10, 10), ...}.
+        Returns the distinct roots inside that box in the container format.
+        """
+        equations = [i().lhs - i().rhs for i in self.eq_list]
+        free = set().union(*(e.free_symbols for e in equations))
+        variables = [v for v in self.symbols if v in free]
+
+        bounds = bounds or {}
+        box = [bounds.get(str(v), bounds.get(v, (-10, 10))) for v in variables]
+
+        solver = NewtonSolver(equations, variables, **options)
+        roots = solver.inside(solver(solver.seeds(box, seeds, seed=seed)), box)
+
+        return [dict(zip(variables, map(float, root))) for root in roots]
+
+    def __call__(self, *args, numeric=False, sparse=False, time_limit=None, memory_limit=None, fallback=None,
+                 **kwargs):
         """
         Solve the system of equations when the instance is called.
+        Square linear systems are solved in matrix form (floats when 'numeric' is True, scipy sparse if 'sparse'),
+        everything else goes through the general sympy solve.
+        With a 'time_limit' (seconds) or 'memory_limit' (bytes) sympy solve runs in a supervised child process. If it
+        does not finish within them, fallback="numeric" returns the roots of self.numeric(**kwargs) instead,
+        otherwise SupervisionError is raised (its 'status' tells "timeout", "memory" or "error").
         """
         container = []
 
+        system = self.linear_system()
+        if system is not None:
+            solution = self.solve_linear(system, numeric, sparse)
+            if solution is not None:
+                container.append(solution)
+                return container
+
+        equations = [i() for i in self.eq_list]
+        symbols = self.symbols
+        solution = Persistent_cache.lookup("solve", equations, symbols)
+
+        if solution is Persistent_cache.MISSING:
+            solution = None
+            if time_limit is not None or memory_limit is not None:
+                supervised = supervise(solve, equations, symbols, time_limit=time_limit, memory_limit=memory_limit)
+                if supervised["status"] != "ok":
+                    if fallback != "numeric":
+                        raise SupervisionError(supervised)
+                    return self.numeric(**kwargs)
+                solution = supervised["value"]
+                Persistent_cache.store("solve", equations, symbols, value=solution)
+
         try:
             # Solve the system and handle the solution appropriately
-            solution = solve((i() for i in self.eq_list), (x, y, z))
+            if solution is None:
+                solution = Persistent_cache.memoize("solve", lambda: solve(equations, symbols), equations, symbols)
 
             if isinstance(solution, dict):
                 # If the solution is a dictionary, append it to the container
                 container.append(solution)
 
-            if isinstance(solution, list):
+            if isinstance(solution, list) and self.variables:
+                # Solutions are tuples in the order of the variables (or dicts)
+                for i in solution:
+                    container.append(i if isinstance(i, dict) else dict(zip(self.variables, i)))
+
+            elif isinstance(solution, list):
                 # Handle a list of solutions based on their length and organize them into dictionaries
                 for i in solution:
                     if len(i) == 3:
@@ -96,6 +220,175 @@ class EquationSolver:
         finally:
             return container
 
+class NewtonSolver:
+    """
+    This class finds numeric roots of a system of equations (expressions equal to zero) by damped Newton iterations
+    started from many seeds at once. The system and its Jacobian are compiled once and every batch of seeds is
+    iterated in a single vectorized loop, which also works on transcendental systems that symbolic solve can't handle.
+    """
+    def __init__(self, expressions, variables, tolerance=1e-10, max_iterations=100, batch_size=4096, jacobian=None,
+                 step_tolerance=1e-8):
+        """
+        Initialize with the list of expressions (each one = 0) and the ordered list of variables to solve for.
+        A seed has converged once the residual norm is below 'tolerance' and the last Newton step below
+        'step_tolerance' (relative to the size of the point), roots closer than sqrt(tolerance) are merged.
+        'jacobian' optionally gives the nonzero Jacobian entries {(row, column): expression}, then only those are
+        compiled and large systems take their Newton steps with scipy sparse solves.
+        """
+        if not isinstance(expressions, list) or not isinstance(variables, list) or len(variables) == 0:
+            raise ValueError('''
+            The expressions and the variables should be zipped in lists
+            ''')
+
+        self.variables = variables
+        self.tolerance = tolerance
+        self.step_tolerance = step_tolerance
+        self.resolution = math.sqrt(tolerance)
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+
+        system = sympy.Matrix(expressions)
+        self.system = sympy.lambdify(variables, list(system), modules='numpy')
+        self.shape = (len(expressions), len(variables))
+
+        if jacobian is None:
+            # Dense, every entry in row-major order
+            jacobian = {(i, j): entry for (i, j), entry in np.ndenumerate(np.array(system.jacobian(variables), dtype=object))}
+        self.entries = sorted(jacobian)
+        self.rows, self.columns = (np.array(index, dtype=int) for index in zip(*self.entries)) if self.entries else (np.empty(0, dtype=int),) * 2
+        self.jacobian = sympy.lambdify(variables, [jacobian[k] for k in self.entries], modules='numpy', cse=True)
+
+    def seeds(self, bounds, count=1000, grid=False, seed=None):
+        """
+        Generate starting points in the box 'bounds' = [(low, high), ...] (one pair per variable),
+        either 'count' uniform random draws or a regular grid of roughly 'count' points.
+        """
+        low, high = np.array(bounds, dtype=float).T
+
+        if grid:
+            per_axis = max(2, int(math.ceil(count ** (1 / len(self.variables)))))
+            axes = [np.linspace(a, b, per_axis) for a, b in zip(low, high)]
+            return np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(self.variables))
+
+        return np.random.default_rng(seed).uniform(low, high, size=(count, len(self.variables)))
+
+    def iterate(self, points):
+        """
+        Run damped Newton on an (S, n) batch of points. Returns the final points and a mask of the converged ones:
+        a small residual alone is not enough, near a multiple root it is reached long before the point stops moving.
+        """
+        points = points.copy()
+        residual = evaluate_kernel(self.system, points, self.shape[0])
+        norm = np.linalg.norm(residual, axis=1)
+        moved = np.full(points.shape[0], np.inf)    # relative length of the last accepted step
+        stalled = np.zeros(points.shape[0], dtype=bool)
+        active = np.isfinite(norm) & (norm > 0)
+
+        for _ in range(self.max_iterations):
+            if not active.any():
+                break
+
+            index = np.flatnonzero(active)
+            step = self.step(points[index], residual[index])
+
+            # Halve the step until the residual goes down (at most 20 times)
+            accepted = np.zeros(index.size, dtype=bool)
+            alpha = 1.0
+            for _ in range(20):
+                pending = np.flatnonzero(~accepted)
+                if pending.size == 0:
+                    break
+                trial = points[index[pending]] - alpha * step[pending]
+                trial_residual = evaluate_kernel(self.system, trial, self.shape[0])
+                trial_norm = np.linalg.norm(trial_residual, axis=1)
+                better = np.isfinite(trial_norm) & (trial_norm < norm[index[pending]])
+                chosen = index[pending[better]]
+                moved[chosen] = alpha * np.linalg.norm(step[pending[better]], axis=1) / (1 + np.linalg.norm(trial[better], axis=1))
+                points[chosen], residual[chosen], norm[chosen] = trial[better], trial_residual[better], trial_norm[better]
+                accepted[pending[better]] = True
+                alpha /= 2
+
+            # Seeds that could not make progress are stalled (at a root, the residual can't go lower in floating point)
+            stalled[index[~accepted]] = True
+            active[index[~accepted]] = False
+            active &= (norm > 0) & ~((norm <= self.tolerance) & (moved <= self.step_tolerance))
+
+        return points, np.isfinite(norm) & (norm <= self.tolerance) & ((moved <= self.step_tolerance) | stalled | (norm == 0))
+
+    def step(self, points, residual):
+        """
+        Return the Newton steps J^+ r for an (S, n) batch. Small systems use the batched dense pseudo-inverse, which
+        keeps the step defined where the Jacobian is singular. Systems with more than 64 unknowns are solved one
+        point at a time with a scipy sparse LU solve (least squares where the Jacobian is singular or not square)
+        when scipy is installed.
+        """
+        values = evaluate_kernel(self.jacobian, points, len(self.entries))
+        scipy = scipy_sparse() if self.shape[1] > 64 else None
+
+        if scipy is not None:
+            sparse_module, linalg = scipy
+            step = np.full(points.shape, np.nan)
+            for s in range(points.shape[0]):
+                matrix = sparse_module.csc_matrix((values[s], (self.rows, self.columns)), shape=self.shape)
+                if self.shape[0] == self.shape[1]:
+                    with warnings.catch_warnings():
+                        # A singular matrix gives a warning and a non-finite solution
+                        warnings.simplefilter("ignore")
+                        step[s] = linalg.spsolve(matrix, residual[s])
+                if not np.all(np.isfinite(step[s])):
+                    step[s] = linalg.lsqr(matrix, residual[s], atol=1e-14, btol=1e-14, iter_lim=10 * self.shape[1])[0]
+            return step
+
+        jacobian = np.zeros((points.shape[0], *self.shape))
+        jacobian[:, self.rows, self.columns] = values
+        return np.einsum('sij,sj->si', np.linalg.pinv(jacobian), residual)
+
+    def unique(self, roots):
+        """
+        Merge roots closer than sqrt(tolerance) (relative to their size), and roots joined by a segment on which the
+        system vanishes: those belong to one solution set that is not isolated (like a line of critical points),
+        which is reported once, by one of its points. Returns the roots sorted.
+        """
+        n = len(self.variables)
+        fractions = np.linspace(0, 1, 11)[1:-1]
+        found = np.empty((0, n))
+
+        for root in roots:
+            if found.shape[0]:
+                distance = np.max(np.abs(found - root) / (1 + np.abs(root)), axis=1)
+                if np.any(distance <= self.resolution):
+                    continue
+                samples = found[:, None, :] + fractions[None, :, None] * (root - found)[:, None, :]
+                residual = evaluate_kernel(self.system, samples.reshape(-1, n), self.shape[0])
+                along = np.linalg.norm(residual, axis=1).reshape(found.shape[0], fractions.size)
+                if np.any(np.all(along <= self.resolution, axis=1)):
+                    continue
+            found = np.vstack([found, root])
+
+        return found[np.lexsort(found.T[::-1])]
+
+    def inside(self, roots, bounds):
+        """
+        Keep the roots inside the box 'bounds' = [(low, high), ...], Newton may run out of the box the seeds came from.
+        """
+        low, high = np.array(bounds, dtype=float).T
+        tolerance = 1e-9 * (1 + np.abs(roots))
+        return roots[np.all((roots >= low - tolerance) & (roots <= high + tolerance), axis=1)]
+
+    def __call__(self, seeds):
+        """
+        Run Newton from every seed (in batches) and return the distinct converged roots as an (R, n) array.
+        """
+        seeds = np.asarray(seeds, dtype=float).reshape(-1, len(self.variables))
+        roots = []
+        # Seeds far from a root may overflow on their way, they are simply dropped as not converged
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            for start in range(0, seeds.shape[0], self.batch_size):
+                points, converged = self.iterate(seeds[start:start + self.batch_size])
+                roots.append(points[converged])
+
+        return self.unique(np.concatenate(roots) if roots else np.empty((0, len(self.variables))))
+
 if __name__ == "__main__":
     # Example system of equations
     e4 = Eq(x*2 + y + z, 2)
@@ -107,3 +400,10 @@ if __name__ == "__main__":
 
     # Solve the system and print the result
     pprint(EquationSolver(l)())
+
+    # The same linear system with a floating point solve
+    pprint(EquationSolver(l)(numeric=True))
+
+    # A transcendental system: give sympy one second, then fall back to multi-start Newton
+    hard = [Equation(Eq(sympy.sin(x) + y**3, 1)), Equation(Eq(sympy.exp(x * y) - x, 2))]
+    pprint(EquationSolver(hard)(time_limit=1, fallback="numeric", bounds={"x": (-3, 3), "y": (-3, 3)}, seed=0))
@@ -0,0 +1,32 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Helpers shared by the compiled numeric kernels (sympy.lambdify) of the package.
+'''
+
+import numpy as np
+
+def evaluate_kernel(kernel, points, count):
+    """
+    Evaluate a compiled kernel returning 'count' components at an (S, n) array of points and return an (S, count)
+    array. Constant components come back from lambdify as scalars, assignment broadcasts them over the points.
+    """
+    points = np.asarray(points, dtype=float)
+    values = np.empty((points.shape[0], count), dtype=float)
+    for i, value in enumerate(kernel(*points.T)):
+        values[:, i] = value
+    return values
+
+def scipy_sparse():
+    """
+    Return the modules (scipy.sparse, scipy.sparse.linalg), or None if scipy is not installed.
+    scipy is optional and slow to import, so the sparse paths only load it when they are taken.
+    """
+    try:
+        import scipy.sparse
+        import scipy.sparse.linalg
+    except ImportError:
+        return None
+
+    return scipy.sparse, scipy.sparse.linalg
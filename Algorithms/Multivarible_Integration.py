@@ -7,16 +7,536 @@
 
 import sympy as sy
 import math
+import numpy as np
+from statistics import NormalDist
 from sympy.abc import x, y, z, r, theta
-from sympy import simplify,pprint, Eq, solve, integrate
+from sympy import pprint, Eq
 import itertools
 
+try:
+    # Imported as part of the Algorithms package
+    from .Profiling import subs, solve, integrate
+    from .Simplification import simplify, get_policy
+    from .Supervisor import supervise, SupervisionError
+    from . import Persistent_cache
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Profiling import subs, solve, integrate
+    from Simplification import simplify, get_policy
+    from Supervisor import supervise, SupervisionError
+    import Persistent_cache
+
+# Gauss-Kronrod (7, 15) rule on [-1, 1] (QUADPACK qk15). Gauss weights are zero on the Kronrod-only nodes.
+KRONROD_NODES = np.array([
+    -0.991455371120812639206854697526329, -0.949107912342758524526189684047851,
+    -0.864864423359769072789712788640926, -0.741531185599394439863864773280788,
+    -0.586087235467691130294144845693013, -0.405845151377397166906606412076961,
+    -0.207784955007898467600689403773245, 0.000000000000000000000000000000000,
+    0.207784955007898467600689403773245, 0.405845151377397166906606412076961,
+    0.586087235467691130294144845693013, 0.741531185599394439863864773280788,
+    0.864864423359769072789712788640926, 0.949107912342758524526189684047851,
+    0.991455371120812639206854697526329,
+])
+KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+    0.204432940075298892414161999234649, 0.190350578064785409913256402421014,
+    0.169004726639267902826583426598550, 0.140653259715525918745189590510238,
+    0.104790010322250183839876322541518, 0.063092092629978553290700663189204,
+    0.022935322010529224963732008058970,
+])
+GAUSS_WEIGHTS = np.array([
+    0.0, 0.129484966168869693270611432679082, 0.0, 0.279705391489276667901467771423780,
+    0.0, 0.381830050505118944950369775488975, 0.0, 0.417959183673469387755102040816327,
+    0.0, 0.381830050505118944950369775488975, 0.0, 0.279705391489276667901467771423780,
+    0.0, 0.129484966168869693270611432679082, 0.0,
+])
+
+
+class CompiledRegion:
+    """
+    This class compiles an integrand and a nested limit list into a vectorized function on the unit hypercube.
+    A point u in [0, 1]^d is mapped to the region variable by variable (outermost first, so inner limits may depend
+    on outer variables) and the integrand is returned multiplied by the Jacobian of that map.
+    """
+    def __init__(self, expression, limit):
+        """
+        Initialize with an expression and limits in the same format as solve_multiple_integral,
+        example - limit = [{"x" : {"a":0,"b":"y"}} , {"y" : {"a":0,"b":7}}, ... ]
+        """
+        if not (isinstance(limit, list) and len(limit) > 0 and all(isinstance(item, dict) for item in limit)):
+            raise ValueError('''
+                 limit should be well formatted 
+                 example - limit = [{"x" : {"a":0,"b":5}} , {"y" : {"a":0,"b":7}}, ... ]
+            ''')
+
+        self.symbols = [self.symbol_of(list(item.keys())[0]) for item in limit]
+        bounds = [list(item.values())[0] for item in limit]
+
+        for k, bound in enumerate(bounds):
+            # A limit may only depend on variables that are integrated after it (the outer ones)
+            outer = set(self.symbols[k + 1:])
+            for end in ("a", "b"):
+                unknown = sy.sympify(bound[end]).free_symbols - outer
+                if unknown:
+                    raise ValueError(f'''
+                    The limit {end} of {self.symbols[k]} depends on {unknown}, only outer variables are allowed
+                    ''')
+
+        unknown = sy.sympify(expression).free_symbols - set(self.symbols)
+        if unknown:
+            raise ValueError(f'''
+            Numeric integration needs every variable to have limits but {unknown} has none
+            ''')
+
+        self.dimension = len(self.symbols)
+        self.integrand = sy.lambdify(self.symbols, expression, modules='numpy')
+        self.lower = [sy.lambdify(self.symbols, bound["a"], modules='numpy') for bound in bounds]
+        self.upper = [sy.lambdify(self.symbols, bound["b"], modules='numpy') for bound in bounds]
+
+    @staticmethod
+    def symbol_of(key):
+        """
+        Return the sympy Symbol for a limit key given either as a Symbol or as its name.
+        """
+        return key if isinstance(key, sy.Symbol) else sy.Symbol(key)
+
+    def __call__(self, u):
+        """
+        Evaluate integrand * Jacobian at an (P, d) array of unit hypercube points and return a (P,) array.
+        """
+        values = np.zeros(u.shape, dtype=float)
+        jacobian = np.ones(u.shape[0], dtype=float)
+
+        for k in reversed(range(self.dimension)):
+            columns = values.T
+            a = self.lower[k](*columns)
+            width = self.upper[k](*columns) - a
+            values[:, k] = a + width * u[:, k]
+            jacobian = jacobian * width
+
+        return np.broadcast_to(self.integrand(*values.T), jacobian.shape) * jacobian
+
+
+class AdaptiveCubature:
+    """
+    Globally adaptive tensor-product Gauss-Kronrod (7, 15) cubature over the unit hypercube.
+    Every round the boxes carrying most of the error are bisected along the dimension with the largest
+    Gauss/Kronrod disagreement, and all new boxes are evaluated in one vectorized batch.
+    """
+    def __init__(self, region, rel_tol=1e-8, abs_tol=0.0, max_evaluations=5_000_000, chunk_points=1 << 18):
+        """
+        Initialize with a CompiledRegion and the tolerances/evaluation budget of the integration.
+        """
+        self.region = region
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.max_evaluations = max_evaluations
+        self.chunk_points = chunk_points
+
+        d = region.dimension
+        nodes = (KRONROD_NODES + 1) / 2
+        # Every combination of the 15 nodes along the d axes, shape (15^d, d)
+        self.grid = np.stack(np.meshgrid(*([nodes] * d), indexing='ij'), axis=-1).reshape(-1, d)
+        self.kronrod = KRONROD_WEIGHTS / 2
+        self.gauss = GAUSS_WEIGHTS / 2
+
+    def contract(self, values, weights):
+        """
+        Apply one 1-D weight vector per axis to values of shape (B, 15, ..., 15) and return a (B,) array.
+        """
+        for w in reversed(weights):
+            values = values @ w
+        return values
+
+    def rules(self, lower, upper):
+        """
+        Apply the Kronrod rule, the full Gauss rule and the per-dimension Gauss rules to a batch of boxes.
+        """
+        d = self.region.dimension
+        size = self.grid.shape[0]
+        boxes_per_chunk = max(1, self.chunk_points // size)
+        values = np.empty((lower.shape[0], size), dtype=float)
+
+        for start in range(0, lower.shape[0], boxes_per_chunk):
+            lo, hi = lower[start:start + boxes_per_chunk], upper[start:start + boxes_per_chunk]
+            points = lo[:, None, :] + (hi - lo)[:, None, :] * self.grid[None, :, :]
+            values[start:start + lo.shape[0]] = self.region(points.reshape(-1, d)).reshape(lo.shape[0], size)
+
+        values = values.reshape((lower.shape[0],) + (KRONROD_NODES.size,) * d)
+        volume = np.prod(upper - lower, axis=1)
+
+        kronrod = self.contract(values, [self.kronrod] * d) * volume
+        gauss = self.contract(values, [self.gauss] * d) * volume
+        per_dimension = np.stack([
+            self.contract(values, [self.gauss if i == k else self.kronrod for i in range(d)]) * volume
+            for k in range(d)
+        ], axis=1)
+
+        return kronrod, np.abs(kronrod - gauss), np.abs(kronrod[:, None] - per_dimension)
+
+    def __call__(self):
+        """
+        Run the adaptive integration and return {"value", "error", "evaluations", "converged"}.
+        """
+        d = self.region.dimension
+        lower, upper = np.zeros((1, d)), np.ones((1, d))
+        value, error, indicator = self.rules(lower, upper)
+        evaluations = self.grid.shape[0]
+
+        while True:
+            total, total_error = value.sum(), error.sum()
+            tolerance = max(self.abs_tol, self.rel_tol * abs(total))
+
+            if total_error <= tolerance or not np.isfinite(total_error):
+                converged = bool(total_error <= tolerance)
+                break
+
+            # Split the worst boxes until they account for half of the remaining error
+            order = np.argsort(error)[::-1]
+            count = int(np.searchsorted(np.cumsum(error[order]), total_error / 2)) + 1
+
+            if evaluations + 2 * count * self.grid.shape[0] > self.max_evaluations:
+                converged = False
+                break
+
+            split, keep = order[:count], order[count:]
+            widths = upper[split] - lower[split]
+            # Bisect along the dimension with the largest Gauss/Kronrod disagreement, the widest one on ties
+            axis = np.argmax(indicator[split] + 1e-300 * widths, axis=1)
+            middle = lower[split, axis] + widths[np.arange(count), axis] / 2
+
+            left_upper = upper[split].copy()
+            left_upper[np.arange(count), axis] = middle
+            right_lower = lower[split].copy()
+            right_lower[np.arange(count), axis] = middle
+
+            new_lower = np.concatenate([lower[split], right_lower])
+            new_upper = np.concatenate([left_upper, upper[split]])
+            new_value, new_error, new_indicator = self.rules(new_lower, new_upper)
+            evaluations += new_lower.shape[0] * self.grid.shape[0]
+
+            lower = np.concatenate([lower[keep], new_lower])
+            upper = np.concatenate([upper[keep], new_upper])
+            value = np.concatenate([value[keep], new_value])
+            error = np.concatenate([error[keep], new_error])
+            indicator = np.concatenate([indicator[keep], new_indicator])
+
+        return {"value": float(total), "error": float(total_error), "evaluations": evaluations, "converged": converged}
+
+
+class QuasiMonteCarloIntegration:
+    """
+    Randomized quasi-Monte Carlo integration for high-dimensional regions.
+    The integrand is evaluated in fixed-size vectorized chunks of a Halton sequence (or plain random points),
+    each of the 'replicates' streams shifted by its own random offset, so the spread between replicates gives
+    a confidence interval. Only running sums are kept, memory stays bounded whatever the number of samples.
+    """
+    def __init__(self, expression, limit, sequence="halton", replicates=16, chunk_size=4096, confidence=0.95,
+                 rel_tol=1e-3, abs_tol=0.0, max_samples=10_000_000, seed=None):
+        """
+        Initialize with an expression and limits in the same format as solve_multiple_integral.
+        """
+        if sequence not in ("halton", "random"):
+            raise ValueError(f'''
+            Parameter - sequence supposed to be "halton" or "random". But got {sequence}
+            ''')
+
+        if replicates < 2:
+            raise ValueError('At least two replicates are needed to estimate a confidence interval.')
+
+        self.region = CompiledRegion(expression, limit)
+        self.sequence = sequence
+        self.replicates = replicates
+        self.chunk_size = chunk_size
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.max_samples = max_samples
+        self.rng = np.random.default_rng(seed)
+        self.quantile = self.student_quantile(confidence, replicates - 1)
+        self.primes = self.first_primes(self.region.dimension)
+
+    @staticmethod
+    def first_primes(count):
+        # The Halton sequence uses one prime base per dimension
+        primes, candidate = [], 2
+        while len(primes) < count:
+            if all(candidate % p for p in primes):
+                primes.append(candidate)
+            candidate += 1
+        return primes
+
+    @staticmethod
+    def student_quantile(confidence, dof):
+        # Two-sided Student t quantile from the normal one (Cornish-Fisher expansion), good to ~1e-3 for dof >= 3
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return (z + (z**3 + z) / (4 * dof) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+                + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * dof**3))
+
+    def halton(self, start, count):
+        """
+        Return the Halton points with indices start + 1 ... start + count as a (count, d) array.
+        """
+        points = np.zeros((count, len(self.primes)), dtype=float)
+        for k, base in enumerate(self.primes):
+            index = np.arange(start + 1, start + count + 1, dtype=np.int64)
+            factor = 1.0 / base
+            while np.any(index > 0):
+                points[:, k] += factor * (index % base)
+                index //= base
+                factor /= base
+        return points
+
+    def stream(self):
+        """
+        Yield a running estimate {"value", "error", "lower", "upper", "samples"} after every chunk,
+        where "error" is the half-width of the confidence interval. The caller may stop iterating at any time.
+        """
+        d = self.region.dimension
+        shifts = self.rng.random((self.replicates, d))
+        sums = np.zeros(self.replicates, dtype=float)
+        count = 0
+
+        while count * self.replicates < self.max_samples:
+            if self.sequence == "halton":
+                base = self.halton(count, self.chunk_size)
+            for r in range(self.replicates):
+                if self.sequence == "halton":
+                    points = (base + shifts[r]) % 1.0
+                else:
+                    points = self.rng.random((self.chunk_size, d))
+                sums[r] += self.region(points).sum()
+            count += self.chunk_size
+
+            estimates = sums / count
+            value = estimates.mean()
+            error = self.quantile * estimates.std(ddof=1) / math.sqrt(self.replicates)
+
+            yield {"value": float(value), "error": float(error), "lower": float(value - error),
+                   "upper": float(value + error), "samples": count * self.replicates}
+
+    def __call__(self):
+        """
+        Run the stream until the confidence half-width meets the tolerance (or max_samples) and return the last estimate.
+        """
+        estimate = None
+        for estimate in self.stream():
+            if estimate["error"] <= max(self.abs_tol, self.rel_tol * abs(estimate["value"])):
+                estimate["converged"] = True
+                return estimate
+
+        if estimate is not None:
+            estimate["converged"] = False
+        return estimate
+
+
+class IntegrationPlanner:
+    """
+    This class chooses the order of a symbolic multiple integral. An order is admissible when no variable's limits
+    depend on a variable integrated before it (Fubini: constant-limit regions admit every order). Each admissible
+    order is scored layer by layer: the cost of integrating the current integrand with respect to the next variable,
+    after which the integrand is replaced by the shape of its antiderivative evaluated at the limits. The cheapest
+    order is used, the caller's order winning ties.
+    """
+    # Cost of integrating one factor with respect to v, by kind
+    POLYNOMIAL = 1
+    ELEMENTARY = 5      # exp/sin/log/... of an argument linear in v, and each integration by parts
+    RATIONAL = 10       # v in a denominator
+    HARD = 100          # a function of a nonlinear argument in v, or v in an exponent with a v-dependent base
+
+    def __init__(self, limit, max_orders=720):
+        """
+        Initialize with the limits in the format of solve_multiple_integral (innermost first). At most 'max_orders'
+        admissible orders are considered.
+        """
+        self.limit = [(CompiledRegion.symbol_of(list(item.keys())[0]), list(item.values())[0]) for item in limit]
+        self.max_orders = max_orders
+        self.depends = {v: set().union(*(sy.sympify(bound[end]).free_symbols for end in ("a", "b")))
+                        for v, bound in self.limit}
+        # Stands for every numeric limit, so substituting a limit like 0 cannot make a layer vanish
+        self.constant = sy.Dummy("c", positive=True)
+
+    def admissible(self):
+        """
+        Yield the admissible orders (innermost first) as tuples of indices into the limits, the caller's order first.
+        """
+        n = len(self.limit)
+        count = 0
+
+        def extend(order, remaining):
+            nonlocal count
+            if count >= self.max_orders:
+                return
+            if not remaining:
+                count += 1
+                yield tuple(order)
+                return
+            for k in remaining:
+                v = self.limit[k][0]
+                # v can be the next inner variable unless a variable integrated later has limits that depend on it
+                if not any(v in self.depends[self.limit[j][0]] for j in remaining if j != k):
+                    yield from extend(order + [k], [j for j in remaining if j != k])
+
+        yield from extend([], list(range(n)))
+
+    @classmethod
+    def cost(cls, expression, v):
+        """
+        Estimate how hard the antiderivative of 'expression' with respect to v is, from its structure.
+        """
+        expression = sy.sympify(expression)
+        if not expression.has(v):
+            return 0
+        if expression.is_polynomial(v):
+            return cls.POLYNOMIAL + sy.degree(expression, v)
+
+        total = 0
+        for term in sy.Add.make_args(sy.expand(expression, deep=False)):
+            factors = [f for f in sy.Mul.make_args(term) if f.has(v)]
+            score = sum(cls.factor_cost(factor, v) for factor in factors)
+            hard_factors = sum(1 for f in factors if not f.is_polynomial(v))
+            if hard_factors:
+                # A polynomial of degree d times a transcendental factor takes d integrations by parts
+                score += cls.ELEMENTARY * cls.degree(term, v)
+            # Products of several non-polynomial factors have no simple antiderivative
+            total += score * max(1, hard_factors)
+
+        return total
+
+    @classmethod
+    def factor_cost(cls, factor, v):
+        # Cost of one factor of a product with respect to v
+        if factor.is_polynomial(v):
+            return cls.POLYNOMIAL
+        if factor.is_Pow:
+            base, exponent = factor.args
+            if exponent.has(v):
+                return cls.ELEMENTARY if not base.has(v) and exponent.is_polynomial(v) and sy.degree(exponent, v) <= 1 else cls.HARD
+            if exponent.is_Integer and exponent < 0:
+                return cls.RATIONAL + cls.factor_cost(base, v)
+            return cls.ELEMENTARY if base.is_polynomial(v) and sy.degree(base, v) <= 1 else cls.HARD
+        if isinstance(factor, sy.Function):
+            argument = factor.args[0] if factor.args else v
+            linear = argument.is_polynomial(v) and sy.degree(argument, v) <= 1
+            return cls.ELEMENTARY if linear else cls.HARD
+        return cls.HARD
+
+    @staticmethod
+    def degree(term, v):
+        # Total degree in v of the polynomial factors of a product
+        return sum(sy.degree(f, v) for f in sy.Mul.make_args(term) if f.has(v) and f.is_polynomial(v))
+
+    @staticmethod
+    def slope(factor, v):
+        # c for a factor g(c*v + d) like exp(x*y) or (x*y + 1)**(1/2), None for every other factor
+        if not factor.has(v) or factor.is_polynomial(v):
+            return None
+        if factor.is_Pow:
+            base, exponent = factor.args
+            argument = exponent if not base.has(v) else (base if not exponent.has(v) else None)
+        elif isinstance(factor, sy.Function) and len(factor.args) == 1:
+            argument = factor.args[0]
+        else:
+            return None
+
+        if argument is None or not argument.is_polynomial(v) or sy.degree(argument, v) != 1:
+            return None
+        return argument.diff(v)
+
+    @classmethod
+    def antiderivative(cls, expression, v):
+        """
+        Return an expression with the shape of the antiderivative of 'expression' with respect to v: a factor
+        g(c*v + d) of a term with polynomial degree d_v in v is divided by c**(1 + d_v) (the substitution and the
+        integrations by parts), every other factor keeps its shape.
+        """
+        terms = []
+        for term in sy.Add.make_args(sy.expand(expression, deep=False)):
+            degree = cls.degree(term, v)
+            factors = []
+            for factor in sy.Mul.make_args(term):
+                slope = cls.slope(factor, v)
+                factors.append(factor if slope is None else factor / slope ** (1 + degree))
+            terms.append(sy.Mul(*factors))
+
+        return sy.Add(*terms)
+
+    def layer(self, expression, k):
+        """
+        Return the estimated cost of integrating 'expression' over the k-th limit, and the shape of the result:
+        the antiderivative evaluated at both limits.
+        """
+        v, bound = self.limit[k]
+        cost = self.cost(expression, v)
+        if self.depends[v]:
+            # Variable limits are substituted into the antiderivative
+            cost += sum(sy.count_ops(sy.sympify(bound[end])) for end in ("a", "b"))
+
+        antiderivative = self.antiderivative(expression, v)
+        limits = {sy.sympify(bound[end]) for end in ("a", "b")}
+        limits = {limit if limit.free_symbols else self.constant for limit in limits}
+        return cost, sy.Add(*(antiderivative.subs(v, limit) for limit in limits))
+
+    def order_cost(self, expression, order, memo=None):
+        """
+        Estimate the cost of integrating in 'order' layer by layer, each layer scored on the shape left by the ones
+        before it. 'memo' (a dict) shares the layers of common inner prefixes between orders.
+        """
+        memo = {} if memo is None else memo
+        memo.setdefault((), (0, sy.sympify(expression)))
+
+        for i in range(1, len(order) + 1):
+            if order[:i] not in memo:
+                total, shape = memo[order[:i - 1]]
+                cost, shape = self.layer(shape, order[i - 1])
+                memo[order[:i]] = (total + cost, shape)
+
+        return memo[tuple(order)][0]
+
+    def __call__(self, expression):
+        """
+        Return the cheapest admissible order as a list of (symbol, {"a", "b"}) pairs, innermost first.
+        Falls back to the caller's order when no order is admissible.
+        """
+        best, best_cost = None, math.inf
+        memo = {}
+        for order in self.admissible():
+            cost = self.order_cost(expression, order, memo)
+            if cost < best_cost:
+                best, best_cost = order, cost
+
+        return [self.limit[k] for k in (best if best is not None else range(len(self.limit)))]
+
+class PartialIntegralCache(Persistent_cache.LRUCache):
+    """
+    A size-bounded LRU cache of partial results of multiple integrals, keyed on (integrand, the layers integrated
+    so far, simplification mode). Re-running an integral with only its outer limits changed reuses the inner layers.
+    """
+    def __init__(self, maxsize=1024):
+        """
+        Initialize an empty cache holding at most 'maxsize' partial results.
+        """
+        super().__init__("integral_layer", maxsize)
+
+# Shared by every MultivariableIntegration
+partial_integral_cache = PartialIntegralCache()
+
 class MultivariableIntegration:
     # This class is designed to handle various types of multivariable integrations
 
-    def get_integration(self, expression, sym):
-        # Function to perform integration of a given expression with respect to a symbol 'sym'
-        ans = integrate(expression, sym)  # Performing the integration
+    def get_integration(self, expression, sym, time_limit=None, memory_limit=None):
+        # Function to perform integration of a given expression with respect to a symbol 'sym'.
+        # With a 'time_limit' (seconds) or 'memory_limit' (bytes) the work runs in a supervised child process and
+        # SupervisionError is raised if it does not finish within them.
+        if time_limit is not None or memory_limit is not None:
+            supervised = supervise(self.get_integration, expression, sym, time_limit=time_limit, memory_limit=memory_limit)
+            if supervised["status"] != "ok":
+                raise SupervisionError(supervised)
+            return supervised["value"]
+
+        ans = Persistent_cache.memoize("integrate", lambda: integrate(expression, sym), expression, sym)  # Performing the integration
         try:
             ans = simplify(ans)  # Attempting to simplify the result of the integration
         except:
@@ -38,13 +558,38 @@ class MultivariableIntegration:
 
         try:
             # Calculating the definite integral by substituting the upper and lower limits
-            return simplify(answer.subs({f"{sym}": limit["b"]}) - answer.subs({f"{sym}": limit["a"]}))
+            return simplify(subs(answer, {f"{sym}": limit["b"]}) - subs(answer, {f"{sym}": limit["a"]}))
         except:
             # In case of an exception, return the difference without simplification
-            return answer.subs({f"{sym}": limit["b"]}) - answer.subs({f"{sym}": limit["a"]})
+            return subs(answer, {f"{sym}": limit["b"]}) - subs(answer, {f"{sym}": limit["a"]})
+
+    def solve_multiple_integral(self, expression, limit, method="symbolic", time_budget=None, memory_limit=None,
+                                order="given", **options):
+        # Function to handle the integration of multiple variables.
+        # The symbolic path integrates in the caller's order, or with order="plan" in the cheapest admissible order
+        # found by IntegrationPlanner, and reuses inner layers already integrated from partial_integral_cache.
+        # method="numeric" uses adaptive cubature and returns {"value", "error", "evaluations", "converged"},
+        # method="qmc" uses QuasiMonteCarloIntegration (best for four or more variables),
+        # method="auto" tries the symbolic path within 'time_budget' seconds (and 'memory_limit' bytes) and falls
+        # back to numeric when it runs out of time or memory, leaves an unevaluated Integral or gives a non-finite
+        # value (nan, zoo, oo). 'options' are passed on to the numeric engine.
+        if method == "numeric":
+            return self.numeric_integral(expression, limit, **options)
+
+        if method == "qmc":
+            return QuasiMonteCarloIntegration(expression, limit, **options)()
+
+        if method == "auto":
+            answer = self.symbolic_within_budget(expression, limit, time_budget, memory_limit, order)
+            if answer is None or not self.settled(sy.sympify(answer)):
+                return self.numeric_integral(expression, limit, **options)
+            return answer
+
+        if method != "symbolic":
+            raise ValueError(f'''
+            Parameter - method supposed to be one of "symbolic", "numeric", "qmc" or "auto". But got {method}
+            ''')
 
-    def solve_multiple_integral(self, expression, limit):
-        # Function to handle the integration of multiple variables
         if not (isinstance(limit, list) and all(isinstance(item, dict) for item in limit)):
             # Checking if limits are provided in the correct format
             print('''
@@ -57,11 +602,50 @@ class MultivariableIntegration:
             # If no limits are provided, return the original expression
             return expression
 
-        # Perform the integration for the first variable in the list
-        integration = self.find_integration_with_limits(expression, eval(list(limit[0].keys())[0]), list(limit[0].values())[0])
+        if order not in ("plan", "given"):
+            raise ValueError(f'''
+            Parameter - order supposed to be "plan" or "given". But got {order}
+            ''')
+
+        if order == "plan":
+            layers = IntegrationPlanner(limit)(expression)
+        else:
+            layers = [(CompiledRegion.symbol_of(list(item.keys())[0]), list(item.values())[0]) for item in limit]
 
-        # Recursively solve the remaining integrals
-        return self.solve_multiple_integral(integration, limit[1:])
+        # The simplification policy changes the form of the answer, so it is part of every cache key
+        mode = get_policy().mode
+
+        def compute():
+            integration = sy.sympify(expression)
+            for k, (sym, bound) in enumerate(layers):
+                # A layer is keyed on the integrand and every layer up to it, not on the outer ones
+                key = (expression, tuple((s, b["a"], b["b"]) for s, b in layers[:k + 1]), mode)
+                integration = partial_integral_cache.get(
+                    key, lambda integrand=integration, sym=sym, bound=bound: self.find_integration_with_limits(integrand, sym, bound))
+            return integration
+
+        return Persistent_cache.memoize("solve_multiple_integral", compute, expression, limit, mode, order)
+
+    def numeric_integral(self, expression, limit, **options):
+        # Function to integrate numerically with vectorized adaptive cubature, inner limits may depend on outer variables
+        return AdaptiveCubature(CompiledRegion(expression, limit), **options)()
+
+    def symbolic_within_budget(self, expression, limit, time_budget, memory_limit=None, order="given"):
+        # Function to run the symbolic integration in a supervised child process, returns None if it exceeds the budget
+        if time_budget is None and memory_limit is None:
+            return self.solve_multiple_integral(expression, limit, order=order)
+
+        supervised = supervise(self.solve_multiple_integral, expression, limit, time_limit=time_budget,
+                               memory_limit=memory_limit, order=order)
+        return supervised["value"] if supervised["status"] == "ok" else None
+
+    @staticmethod
+    def settled(answer):
+        # Function to tell whether a symbolic answer is usable: no unevaluated Integral left and nothing non-finite,
+        # sympy returns nan when a limit of the antiderivative is indeterminate (x*exp(x*y) in the given order)
+        if answer.has(sy.Integral, sy.nan, sy.zoo, sy.oo, -sy.oo):
+            return False
+        return not (answer.is_number and answer.is_finite is False)
 
 
 if __name__ == "__main__":
@@ -81,4 +665,27 @@ if __name__ == "__main__":
        pprint(answer)
 
     except:
-        print(" Something went wrong!. Please ensure you gave the valid input.")
\ No newline at end of file
+        print(" Something went wrong!. Please ensure you gave the valid input.")
+
+    # Numeric cubature with a variable inner limit: the area of the triangle 0 <= x <= y <= 1
+    pprint(solve.solve_multiple_integral(x * y, [{"x": {"a": 0, "b": y}}, {"y": {"a": 0, "b": 1}}], method="numeric"))
+
+    # Six-dimensional integral with streaming quasi-Monte Carlo estimates, stopped once the interval is tight enough
+    box = [{str(s): {"a": 0, "b": 1}} for s in sy.symbols("u0:6")]
+    for estimate in QuasiMonteCarloIntegration(sy.exp(-sum(s**2 for s in sy.symbols("u0:6"))), box, seed=0).stream():
+        if estimate["error"] < 1e-4:
+            break
+    pprint(estimate)
+
+    # Given x innermost, but the planner integrates y first: the x cancels and no integration by parts is needed
+    limits = [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": sy.pi / 2}}]
+    print([v for v, _ in IntegrationPlanner(limits)(x * sy.cos(x * y))])
+    pprint(solve.solve_multiple_integral(x * sy.cos(x * y), limits, order="plan"))
+
+    # Only the outer limit changes, the inner layer comes from the partial result cache
+    for b in (1, 2, 3):
+        solve.solve_multiple_integral(x * y**2, [{"x": {"a": 0, "b": y}}, {"y": {"a": 0, "b": b}}])
+    print(partial_integral_cache.stats())
+
+    # Give the symbolic path two seconds and fall back to numeric cubature after that
+    pprint(solve.solve_multiple_integral(sy.exp(-x**2 * y), limit[:2], method="auto", time_budget=2))
\ No newline at end of file
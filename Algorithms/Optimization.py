@@ -0,0 +1,271 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Gradient based minimization (and maximization) of expressions in any number of variables, from many starting
+  points at once. The value and the gradient are differentiated once and compiled into a single numeric kernel,
+  every iteration then advances the whole batch of starting points with vectorized numpy operations.
+'''
+
+import numpy as np
+import sympy
+
+try:
+    # Imported as part of the Algorithms package
+    from .Derivatives import derivative_cache
+    from .Kernels import evaluate_kernel
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Derivatives import derivative_cache
+    from Kernels import evaluate_kernel
+
+class GradientOptimizer:
+    """
+    This class minimizes an expression with projected gradient descent (Armijo line search), momentum or L-BFGS,
+    running S starting points as one (S, n) batch. Box constraints are handled by projecting every step onto the box.
+    """
+    METHODS = ("gradient_descent", "momentum", "lbfgs")
+
+    def __init__(self, expression, variables=None, method="lbfgs", bounds=None, tolerance=1e-6, max_iterations=500,
+                 memory=10, learning_rate=1e-2, momentum=0.9, maximize=False):
+        """
+        Initialize with the expression, the ordered variables (default: its free symbols sorted by name), the method,
+        the box 'bounds' = {symbol or name: (low, high)} (None or a missing variable means unbounded) and the stopping
+        tolerance on the projected gradient. 'memory' is the L-BFGS history length, 'learning_rate' and 'momentum'
+        set the momentum method. With 'maximize' the expression is maximized instead.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f'''
+            Parameter - method supposed to be one of {self.METHODS}. But got {method}
+            ''')
+
+        self.expression = sympy.sympify(expression)
+        self.variables = list(variables) if variables else sorted(self.expression.free_symbols, key=str)
+        if not self.variables:
+            raise ValueError(f'''
+            The expression {self.expression} has no variables to optimize over
+            ''')
+
+        self.method = method
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.memory = memory
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self.sign = -1.0 if maximize else 1.0
+
+        bounds = {str(k): v for k, v in (bounds or {}).items()}
+        box = [bounds.get(str(v)) or (None, None) for v in self.variables]
+        self.low = np.array([-np.inf if low is None else float(low) for low, _ in box])
+        self.high = np.array([np.inf if high is None else float(high) for _, high in box])
+
+        gradient = [derivative_cache.derivative(self.expression, v) for v in self.variables]
+        self.kernel = sympy.lambdify(self.variables, [self.expression] + gradient, modules='numpy', cse=True)
+
+    def evaluate(self, points):
+        """
+        Return the (S,) values and the (S, n) gradients of the minimized function at (S, n) points.
+        """
+        outputs = evaluate_kernel(self.kernel, points, 1 + points.shape[1])
+        return self.sign * outputs[:, 0], self.sign * outputs[:, 1:]
+
+    def project(self, points):
+        return np.clip(points, self.low, self.high)
+
+    def stationarity(self, points, gradient):
+        # Norm of the projected gradient, zero exactly at the (box constrained) stationary points
+        return np.linalg.norm(points - self.project(points - gradient), axis=1)
+
+    def seeds(self, count=100, seed=None):
+        """
+        Draw 'count' uniform starting points in the box, every variable needs finite bounds.
+        """
+        if not (np.all(np.isfinite(self.low)) and np.all(np.isfinite(self.high))):
+            raise ValueError('''
+            Random starting points need finite bounds for every variable, otherwise pass the starts explicitly
+            ''')
+
+        return np.random.default_rng(seed).uniform(self.low, self.high, size=(count, len(self.variables)))
+
+    def line_search(self, points, values, gradient, direction, step):
+        """
+        Backtracking (Armijo) search along the projected path P(x + t*d), halving each row's t until the value drops
+        enough (at most 40 times). Returns the new points, values, gradients, the accepted steps and the accepted mask.
+        Near a minimum, where the drop is lost in the rounding of the value, the approximate Wolfe test of Hager and
+        Zhang (value not up by more than the rounding, slope along the step still bounded) is used instead.
+        """
+        new_points, new_values, new_gradient = points.copy(), values.copy(), gradient.copy()
+        accepted = np.zeros(len(points), dtype=bool)
+        step = step.copy()
+
+        for _ in range(40):
+            pending = np.flatnonzero(~accepted)
+            if pending.size == 0:
+                break
+
+            trial = self.project(points[pending] + step[pending, None] * direction[pending])
+            trial_values, trial_gradient = self.evaluate(trial)
+            decrease = np.einsum('ij,ij->i', gradient[pending], trial - points[pending])
+            slope = np.einsum('ij,ij->i', trial_gradient, trial - points[pending])
+            armijo = trial_values <= values[pending] + 1e-4 * decrease
+            rounding = 1e-12 * (1 + np.abs(values[pending]))
+            wolfe = (trial_values <= values[pending] + rounding) & (slope <= -(1 - 2e-4) * decrease)
+            good = np.isfinite(trial_values) & (decrease < 0) & (armijo | wolfe)
+
+            chosen = pending[good]
+            new_points[chosen], new_values[chosen], new_gradient[chosen] = trial[good], trial_values[good], trial_gradient[good]
+            accepted[chosen] = True
+            step[pending[~good]] /= 2
+
+        return new_points, new_values, new_gradient, step, accepted
+
+    def lbfgs_direction(self, gradient, history):
+        """
+        Two-loop recursion over the stored (s, y) pairs, vectorized over the rows. Pairs are kept in a ring shared by
+        all rows; a row's invalid pairs have rho = 0 and drop out of the recursion.
+        """
+        s, y, rho, newest = history["s"], history["y"], history["rho"], history["newest"]
+        order = [(newest - k) % self.memory for k in range(self.memory)]
+        q = gradient.copy()
+        alpha = np.zeros((self.memory, len(gradient)))
+
+        for k in order:
+            alpha[k] = rho[k] * np.einsum('ij,ij->i', s[k], q)
+            q -= alpha[k, :, None] * y[k]
+
+        # Scale by s.y / y.y of the newest valid pair, or normalize the first step
+        sy = np.einsum('ij,ij->i', s[newest], y[newest])
+        yy = np.einsum('ij,ij->i', y[newest], y[newest])
+        fresh = 1 / np.maximum(1.0, np.abs(gradient).max(axis=1))
+        gamma = np.where((rho[newest] > 0) & (yy > 0), sy / np.where(yy > 0, yy, 1), fresh)
+        r = gamma[:, None] * q
+
+        for k in reversed(order):
+            beta = rho[k] * np.einsum('ij,ij->i', y[k], r)
+            r += s[k] * (alpha[k] - beta)[:, None]
+
+        return -r
+
+    def iterate(self, starts):
+        """
+        Run the chosen method from an (S, n) batch of starts. Rows stop when their projected gradient is below the
+        tolerance or when no step decreases the value any further.
+        """
+        points = self.project(np.array(starts, dtype=float).reshape(-1, len(self.variables)))
+        S, n = points.shape
+        values, gradient = self.evaluate(points)
+        norm = self.stationarity(points, gradient)
+        active = np.isfinite(values) & (norm > self.tolerance)
+        iterations = np.zeros(S, dtype=int)
+        trace = {"value": [values.copy()], "gradient_norm": [norm.copy()]}
+
+        step = np.ones(S)
+        stalls = np.zeros(S, dtype=int)
+        best_norm = norm.copy()
+        velocity = np.zeros((S, n))
+        history = {"s": np.zeros((self.memory, S, n)), "y": np.zeros((self.memory, S, n)),
+                   "rho": np.zeros((self.memory, S)), "newest": 0}
+
+        for _ in range(self.max_iterations):
+            index = np.flatnonzero(active)
+            if index.size == 0:
+                break
+
+            if self.method == "momentum":
+                velocity[index] = self.momentum * velocity[index] - self.learning_rate * gradient[index]
+                trial = self.project(points[index] + velocity[index])
+                trial_values, trial_gradient = self.evaluate(trial)
+                # Restart the momentum of the rows whose value went up
+                velocity[index[trial_values > values[index]]] = 0
+                finite = np.isfinite(trial_values)
+                chosen = index[finite]
+                points[chosen], values[chosen], gradient[chosen] = trial[finite], trial_values[finite], trial_gradient[finite]
+                active[index[~finite]] = False
+            else:
+                g = gradient[index]
+                if self.method == "lbfgs":
+                    view = {k: history[k][:, index] for k in ("s", "y", "rho")}
+                    view["newest"] = history["newest"]
+                    direction = self.lbfgs_direction(g, view)
+                    step[index] = 1.0
+                else:
+                    direction = -g
+                    step[index] = np.minimum(2 * step[index], 1e6)
+
+                # Do not push variables that sit on the box outwards, and fall back to steepest descent
+                # (clearing the history) where that no longer gives a descent direction
+                at_low = (points[index] <= self.low) & (direction < 0)
+                at_high = (points[index] >= self.high) & (direction > 0)
+                direction[at_low | at_high] = 0
+                uphill = np.einsum('ij,ij->i', g, direction) >= 0
+                direction[uphill] = -g[uphill]
+                history["rho"][:, index[uphill]] = 0
+
+                new_points, new_values, new_gradient, step[index], accepted = self.line_search(
+                    points[index], values[index], g, direction, step[index])
+
+                if self.method == "lbfgs":
+                    s, y = new_points - points[index], new_gradient - g
+                    sy = np.einsum('ij,ij->i', s, y)
+                    newest = (history["newest"] + 1) % self.memory
+                    history["s"][newest, index], history["y"][newest, index] = s, y
+                    history["rho"][newest, index] = np.where(accepted & (sy > 1e-12), 1 / np.where(sy > 1e-12, sy, 1), 0)
+                    history["newest"] = newest
+
+                # Rows where neither the value nor the projected gradient has gone down for 10 iterations
+                # are stuck at the precision of the arithmetic
+                progress = ((values[index] - new_values > 4 * np.finfo(float).eps * (1 + np.abs(values[index])))
+                            | (self.stationarity(new_points, new_gradient) < best_norm[index]))
+                stalls[index] = np.where(progress, 0, stalls[index] + 1)
+                points[index], values[index], gradient[index] = new_points, new_values, new_gradient
+                active[index[~accepted | (stalls[index] >= 10)]] = False
+
+            iterations[index] += 1
+            norm[index] = self.stationarity(points[index], gradient[index])
+            best_norm[index] = np.minimum(best_norm[index], norm[index])
+            active &= norm > self.tolerance
+            trace["value"].append(values.copy())
+            trace["gradient_norm"].append(norm.copy())
+
+        return points, values, norm, iterations, trace
+
+    def __call__(self, starts=None, count=100, seed=None):
+        """
+        Optimize from 'starts' ((S, n) array or list of {symbol or name: value} dicts) or from 'count' random points
+        in the box. Returns {"points", "values", "converged", "iterations", "best", "best_value",
+        "trace": {"value": (T, S), "gradient_norm": (T, S)}}, values and traces of the original (not negated) expression.
+        """
+        if starts is None:
+            starts = self.seeds(count, seed)
+        elif isinstance(starts, (list, tuple)) and starts and isinstance(starts[0], dict):
+            starts = [[float(p.get(v, p.get(str(v)))) for v in self.variables] for p in starts]
+
+        # Rows wandering off to infinity overflow on their way, they are reported as not converged
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            points, values, norm, iterations, trace = self.iterate(starts)
+
+        converged = np.isfinite(values) & (norm <= self.tolerance)
+        best = int(np.nanargmin(np.where(np.isfinite(values), values, np.nan))) if np.isfinite(values).any() else None
+
+        return {"points": points, "values": self.sign * values, "converged": converged, "iterations": iterations,
+                "best": None if best is None else dict(zip(self.variables, points[best].tolist())),
+                "best_value": None if best is None else self.sign * values[best],
+                "trace": {"value": self.sign * np.array(trace["value"]), "gradient_norm": np.array(trace["gradient_norm"])}}
+
+
+if __name__ == "__main__":
+    from sympy.abc import x, y
+
+    # Rosenbrock from 64 random starts with L-BFGS
+    rosenbrock = (1 - x)**2 + 100 * (y - x**2)**2
+    result = GradientOptimizer(rosenbrock, bounds={"x": (-2, 2), "y": (-1, 3)})(count=64, seed=0)
+    print(result["best"], result["best_value"], result["converged"].mean(), result["iterations"].max())
+
+    # A non-convex landscape in a box, every local minimum found from a grid of starts
+    landscape = sympy.sin(3 * x) * sympy.cos(2 * y) + (x**2 + y**2) / 10
+    optimizer = GradientOptimizer(landscape, method="gradient_descent", bounds={"x": (-2, 2), "y": (-2, 2)})
+    result = optimizer(count=200, seed=1)
+    print(np.unique(np.round(result["points"][result["converged"]], 4), axis=0))
+
+    # Maximize with momentum
+    print(GradientOptimizer(-(x - 1)**2 - (y + 2)**2, method="momentum", maximize=True, learning_rate=0.1)([[0, 0], [5, 5]])["points"])
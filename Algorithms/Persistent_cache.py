@@ -0,0 +1,283 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Persistent, content-addressed cache of symbolic results shared by all processes of one machine.
+'''
+
+import contextlib
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    # Imported as part of the Algorithms package
+    from .Profiling import profiler
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Profiling import profiler
+
+# Frames of this module are skipped when the profiler attributes a call to its caller
+profiler.transparent.add(__name__)
+
+# Returned by lookup() when there is no cached value (None is a valid cached result)
+MISSING = object()
+
+def canonical(value):
+    """
+    Return a canonical text form of an expression or of operation arguments, used to build cache keys.
+    sympy objects use srepr (structural, independent of printing settings), dicts are sorted by key.
+    """
+    from sympy import Basic, srepr
+
+    if isinstance(value, Basic):
+        return srepr(value)
+    if isinstance(value, dict):
+        return "{" + ",".join(sorted(f"{canonical(k)}:{canonical(v)}" for k, v in value.items())) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(canonical(v) for v in value) + "]"
+    return repr(value)
+
+class PersistentCache:
+    """
+    This class stores results in a SQLite database keyed on the SHA-256 of (operation, canonical arguments).
+    SQLite in WAL mode makes it safe for concurrent readers and writers, and the least recently used entries
+    are evicted once the stored values exceed 'max_bytes'. Summing the stored sizes scans the table, so a process
+    only checks again after storing as many bytes as were free at its last check (at most 10 % of 'max_bytes').
+    """
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        """
+        Initialize with the database file (or a directory, which then holds "symbolic_cache.sqlite").
+        """
+        if os.path.isdir(path) or path.endswith(os.sep):
+            os.makedirs(path, exist_ok=True)
+            path = os.path.join(path, "symbolic_cache.sqlite")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._unchecked = 0   # bytes stored by this process since the size was last checked
+        self._headroom = 0    # bytes that may be stored before checking again
+        self._local = threading.local()
+
+        with self.connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS entries "
+                       "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def connection(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        if getattr(self._local, "pid", None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return self._local.db
+
+    @staticmethod
+    def key(operation, *args):
+        """
+        Return the content address of an operation applied to its arguments.
+        """
+        return hashlib.sha256(f"{operation}|{canonical(args)}".encode()).hexdigest()
+
+    def lookup(self, operation, *args):
+        """
+        Return the cached result of operation(*args), or MISSING.
+        """
+        key = self.key(operation, *args)
+        db = self.connection()
+        row = db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return MISSING
+
+        self.hits += 1
+        try:
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError:
+            # Another process holds the write lock, the access time is only a hint for eviction
+            pass
+        return pickle.loads(row[0])
+
+    def store(self, operation, *args, value):
+        """
+        Store the result of operation(*args) and evict old entries if the cache may have grown over its size.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        db = self.connection()
+        db.execute("INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                   (self.key(operation, *args), blob, len(blob), time.time()))
+        self._unchecked += len(blob)
+        if self._unchecked >= self._headroom:
+            self.evict()
+
+    def memoize(self, operation, compute, *args):
+        """
+        Return the cached result of operation(*args), calling compute() and storing its result on a miss.
+        """
+        value = self.lookup(operation, *args)
+        if value is MISSING:
+            value = compute()
+            self.store(operation, *args, value=value)
+        return value
+
+    def evict(self):
+        """
+        Delete least recently used entries until the stored values take at most 90 % of max_bytes.
+        """
+        db = self.connection()
+        total = db.execute("SELECT total(size) FROM entries").fetchone()[0]
+
+        if total > self.max_bytes:
+            target = total - 0.9 * self.max_bytes
+            freed = 0
+            victims = []
+            for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                victims.append((key,))
+                freed += size
+                if freed >= target:
+                    break
+            db.executemany("DELETE FROM entries WHERE key = ?", victims)
+            total -= freed
+
+        self._unchecked = 0
+        self._headroom = min(self.max_bytes - total, 0.1 * self.max_bytes)
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process and the number and total size of the stored entries.
+        """
+        count, size = self.connection().execute("SELECT count(*), total(size) FROM entries").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": int(size),
+                "max_bytes": self.max_bytes, "path": self.path}
+
+    def clear(self):
+        """
+        Delete every stored entry and reset the counters.
+        """
+        self.connection().execute("DELETE FROM entries")
+        self.hits = 0
+        self.misses = 0
+        self._unchecked = 0
+        self._headroom = 0
+
+# The cache used by Differentiation, EquationSolver and MultivariableIntegration, None while disabled
+_active = None
+
+def enable(path=None, max_bytes=256 * 1024 * 1024):
+    """
+    Turn the persistent cache on (default location: ~/.cache/multivariable_calculus/).
+    """
+    global _active
+    path = path or os.path.join(os.path.expanduser("~"), ".cache", "multivariable_calculus") + os.sep
+    _active = PersistentCache(path, max_bytes)
+    return _active
+
+def disable():
+    """
+    Turn the persistent cache off, the stored entries stay on disk.
+    """
+    global _active
+    _active = None
+
+@contextlib.contextmanager
+def disabled():
+    """
+    Turn the persistent cache off for the body of a with-block (like cold benchmark runs), the entries are kept.
+    """
+    global _active
+    previous, _active = _active, None
+    try:
+        yield
+    finally:
+        _active = previous
+
+def active():
+    """
+    Return the cache in use or None.
+    """
+    return _active
+
+def lookup(operation, *args):
+    # MISSING when the cache is disabled or has no entry
+    return MISSING if _active is None else _active.lookup(operation, *args)
+
+def store(operation, *args, value):
+    if _active is not None:
+        _active.store(operation, *args, value=value)
+
+def memoize(operation, compute, *args):
+    # Plain compute() when the cache is disabled
+    return compute() if _active is None else _active.memoize(operation, compute, *args)
+
+class LRUCache:
+    """
+    A size-bounded, thread-safe in-memory LRU cache in front of the persistent cache. Results of 'operation' are
+    kept by key, a miss falls back to memoize() (a no-op unless the persistent cache is enabled).
+    """
+    def __init__(self, operation, maxsize):
+        """
+        Initialize an empty cache for results of 'operation' holding at most 'maxsize' entries.
+        """
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError(f'''
+            Parameter - maxsize supposed to be a positive integer. But got {maxsize}
+            ''')
+
+        self.operation = operation
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """
+        Return the result stored under the tuple 'key', calling compute() only on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        result = memoize(self.operation, compute, *key)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            # Evict the least recently used entries once the bound is exceeded
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return result
+
+    def stats(self):
+        """
+        Return the hit/miss counters and the current size of the cache.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self):
+        """
+        Drop every entry and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+if os.environ.get("ALGORITHMS_CACHE_DIR"):
+    enable(os.environ["ALGORITHMS_CACHE_DIR"] + os.sep)
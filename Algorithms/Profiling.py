@@ -0,0 +1,174 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Opt-in instrumentation of the symbolic primitives (diff, simplify, subs, solve, integrate).
+'''
+
+import json
+import os
+import sys
+import threading
+import time
+
+class SymbolicProfiler:
+    """
+    This class records call counts, cumulative time and input expression size of the symbolic primitives,
+    attributed to the calling class and method. It is off by default; while disabled a profiled primitive costs
+    a single attribute check on top of the sympy call.
+    """
+    PRIMITIVES = ("diff", "simplify", "subs", "solve", "integrate")
+
+    def __init__(self, enabled=False):
+        """
+        Initialize an empty profiler, optionally already enabled.
+        """
+        self.enabled = enabled
+        self.records = {}
+        # Modules and classes whose frames are skipped when looking for the caller (thin helpers like Simplification
+        # and the caches), lambda frames are always skipped
+        self.transparent = {__name__}
+        self.transparent_classes = set()
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """
+        Turn the instrumentation on globally.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """
+        Turn the instrumentation off globally, the recorded statistics are kept.
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Drop every recorded statistic.
+        """
+        with self._lock:
+            self.records = {}
+
+    def __enter__(self):
+        """
+        Profile the body of a with-block (starting from fresh statistics), nested blocks share the outermost one.
+        """
+        if self._depth == 0:
+            self.reset()
+        self._depth += 1
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            self.disable()
+        return False
+
+    @staticmethod
+    def size_of(expression):
+        # Number of nodes of the expression tree, 1 for plain numbers and other non sympy objects
+        from sympy import Basic, preorder_traversal
+        if isinstance(expression, Basic):
+            return sum(1 for _ in preorder_traversal(expression))
+        return 1
+
+    def record(self, primitive, caller, seconds, size):
+        """
+        Add one call of 'primitive' made from 'caller' (like "Differentiation.differentiate").
+        """
+        with self._lock:
+            entry = self.records.setdefault((primitive, caller), [0, 0.0, 0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += size
+            entry[3] = max(entry[3], size)
+
+    def is_transparent(self, frame):
+        # Whether the frame belongs to a helper the call passes through rather than to the code that asked for it
+        code = frame.f_code
+        return (frame.f_globals.get("__name__") in self.transparent or code.co_name == "<lambda>"
+                or getattr(code, "co_qualname", "").split(".")[0] in self.transparent_classes)
+
+    def call(self, primitive, function, expression, args, kwargs):
+        """
+        Run function(*args, **kwargs) and record it against the code that used the primitive.
+        """
+        frame = sys._getframe(2)
+        while frame.f_back is not None and self.is_transparent(frame):
+            frame = frame.f_back
+        caller = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        size = self.size_of(expression)
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.record(primitive, caller, time.perf_counter() - start, size)
+
+    def wrap(self, primitive):
+        """
+        Return a profiled version of the sympy function named 'primitive' (its first argument is the expression).
+        sympy itself is only imported on the first call.
+        """
+        function = None
+
+        def profiled(*args, **kwargs):
+            nonlocal function
+            if function is None:
+                import sympy
+                function = getattr(sympy, primitive)
+            if not self.enabled:
+                return function(*args, **kwargs)
+            return self.call(primitive, function, args[0] if args else None, args, kwargs)
+
+        profiled.__name__ = primitive
+        profiled.__qualname__ = primitive
+        return profiled
+
+    def summary(self):
+        """
+        Return one dict per (primitive, caller) sorted by cumulative time, slowest first.
+        """
+        with self._lock:
+            rows = [
+                {"primitive": primitive, "caller": caller, "calls": calls, "seconds": seconds,
+                 "mean_size": total_size / calls, "max_size": max_size}
+                for (primitive, caller), (calls, seconds, total_size, max_size) in self.records.items()
+            ]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def table(self):
+        """
+        Return the summary formatted as a plain text table.
+        """
+        header = f"{'primitive':<10} {'caller':<45} {'calls':>8} {'seconds':>10} {'mean size':>10} {'max size':>9}"
+        lines = [header, "-" * len(header)]
+        for row in self.summary():
+            lines.append(f"{row['primitive']:<10} {row['caller']:<45} {row['calls']:>8} {row['seconds']:>10.4f} "
+                         f"{row['mean_size']:>10.1f} {row['max_size']:>9}")
+        return "\n".join(lines)
+
+    def to_json(self, **kwargs):
+        """
+        Return the summary as a JSON string.
+        """
+        return json.dumps(self.summary(), **kwargs)
+
+# The process wide profiler, also switched on by setting the ALGORITHMS_PROFILE environment variable
+profiler = SymbolicProfiler(enabled=bool(os.environ.get("ALGORITHMS_PROFILE")))
+
+diff = profiler.wrap("diff")
+simplify = profiler.wrap("simplify")
+solve = profiler.wrap("solve")
+integrate = profiler.wrap("integrate")
+
+def subs(expression, *args, **kwargs):
+    """
+    Profiled expression.subs(*args, **kwargs).
+    """
+    if not profiler.enabled:
+        return expression.subs(*args, **kwargs)
+    return profiler.call("subs", expression.subs, expression, args, kwargs)
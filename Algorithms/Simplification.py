@@ -0,0 +1,142 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Global and per-call simplification policy used instead of calling sympy.simplify eagerly.
+'''
+
+import contextlib
+import contextvars
+import signal
+import threading
+
+try:
+    # Imported as part of the Algorithms package
+    from . import Profiling
+except ImportError:
+    # Run from inside the Algorithms directory
+    import Profiling
+
+profiler = Profiling.profiler
+
+# Frames of this module are skipped when the profiler attributes a call to its caller
+profiler.transparent.add(__name__)
+
+class SimplificationTimeout(Exception):
+    """
+    Raised inside a budgeted simplification when it runs out of time.
+    """
+
+class SimplificationPolicy:
+    """
+    This class decides how much simplification an expression gets:
+      "off"    - return the expression untouched (results stay lazy, see canonical()),
+      "cheap"  - expand and cancel only,
+      "full"   - sympy.simplify,
+      "budget" - sympy.simplify if the expression has at most 'max_size' operations and finishes within
+                 'max_seconds', otherwise the expression is left as it is. The time limit needs a timer signal,
+                 so off the main thread (or while another interval timer runs) nothing is simplified.
+    """
+    MODES = ("off", "cheap", "full", "budget")
+
+    def __init__(self, mode="full", max_seconds=1.0, max_size=500):
+        """
+        Initialize the policy with a mode and the limits of the "budget" mode.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f'''
+            Parameter - mode supposed to be one of {self.MODES}. But got {mode}
+            ''')
+
+        self.mode = mode
+        self.max_seconds = max_seconds
+        self.max_size = max_size
+
+    def __repr__(self):
+        return f"SimplificationPolicy(mode={self.mode!r}, max_seconds={self.max_seconds}, max_size={self.max_size})"
+
+    def __call__(self, expression):
+        """
+        Simplify the expression as much as the policy allows.
+        """
+        from sympy import Basic, count_ops
+
+        if self.mode == "off" or not isinstance(expression, Basic):
+            return expression
+
+        if self.mode == "cheap":
+            return self.cheap(expression)
+
+        if self.mode == "full":
+            return Profiling.simplify(expression)
+
+        if count_ops(expression) > self.max_size:
+            return expression
+
+        return self.within_time(expression)
+
+    @staticmethod
+    def cheap(expression):
+        # Expand and cancel are polynomial time, unlike the heuristics tried by simplify
+        from sympy import cancel, expand
+        return cancel(expand(expression))
+
+    def within_time(self, expression):
+        # A timer signal can only interrupt sympy in the main thread, without one the time budget cannot be kept
+        if threading.current_thread() is not threading.main_thread() or signal.getitimer(signal.ITIMER_REAL)[0]:
+            return expression
+
+        def on_timeout(signum, frame):
+            raise SimplificationTimeout()
+
+        previous = signal.signal(signal.SIGALRM, on_timeout)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, self.max_seconds)
+            return Profiling.simplify(expression)
+        except SimplificationTimeout:
+            return expression
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+# The process wide policy ("full" keeps the historic behaviour) and an optional per-call override
+_global_policy = SimplificationPolicy("full")
+_current_policy = contextvars.ContextVar("simplification_policy", default=None)
+
+def set_policy(mode, **limits):
+    """
+    Set the process wide simplification policy, like set_policy("budget", max_seconds=0.2).
+    """
+    global _global_policy
+    _global_policy = SimplificationPolicy(mode, **limits)
+    return _global_policy
+
+def get_policy():
+    """
+    Return the policy in effect for the current call (a using() override or the global one).
+    """
+    return _current_policy.get() or _global_policy
+
+@contextlib.contextmanager
+def using(mode, **limits):
+    """
+    Override the simplification policy for the body of a with-block, like: with using("off"): TangentPlane(f, p)()
+    """
+    token = _current_policy.set(SimplificationPolicy(mode, **limits))
+    try:
+        yield _current_policy.get()
+    finally:
+        _current_policy.reset(token)
+
+def simplify(expression, mode=None, **limits):
+    """
+    Simplify the expression under the current policy, or under 'mode' for this call only.
+    """
+    policy = SimplificationPolicy(mode, **limits) if mode else get_policy()
+    return policy(expression)
+
+def canonical(expression):
+    """
+    Return the fully simplified form whatever the policy, for results that were left lazy.
+    """
+    return Profiling.simplify(expression)
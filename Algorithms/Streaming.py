@@ -0,0 +1,168 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Out-of-core evaluation of gradient fields. Points are read from a memory-mapped .npy file of shape (N, 3)
+  and the results written to a memory-mapped .npy file chunk by chunk, so memory use does not grow with N:
+
+      GradientFieldStream(x**2 + y**2 + z**2, "unit_normal")("points.npy", "normals.npy", workers=4)
+
+  Finished chunks are recorded in "<target>.progress.json", an interrupted run picks up where it stopped.
+'''
+
+import concurrent.futures
+import functools
+import hashlib
+import json
+import os
+import numpy as np
+
+try:
+    # Imported as part of the Algorithms package
+    from .Vector_tools import FindGradient, SurfaceMesh
+    from .Persistent_cache import canonical
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Vector_tools import FindGradient, SurfaceMesh
+    from Persistent_cache import canonical
+
+# Quantity -> columns of the output (None for one value per point)
+QUANTITIES = {"gradient": 3, "norm": None, "unit_normal": 3}
+
+@functools.lru_cache(maxsize=16)
+def _evaluator(expression, quantity):
+    # Compiled once per process and reused for every chunk
+    return SurfaceMesh(expression) if quantity == "unit_normal" else FindGradient(expression)
+
+def _run_chunk(expression, quantity, source, target, start, stop):
+    """
+    Evaluate one chunk of points and write it to the target file, returns (start, stop) once the chunk is on disk.
+    Runs in a worker process, so both files are opened by path.
+    """
+    points = np.load(source, mmap_mode='r')[start:stop]
+    output = np.load(target, mmap_mode='r+')
+    evaluator = _evaluator(expression, quantity)
+
+    if quantity == "unit_normal":
+        evaluator(points, normals=output[start:stop])
+    else:
+        gradient = evaluator.batch(points)
+        output[start:stop] = gradient if quantity == "gradient" else np.sqrt(np.einsum('ij,ij->i', gradient, gradient))
+
+    output.flush()
+    return start, stop
+
+class GradientFieldStream:
+    """
+    This class evaluates the gradient, its norm or the unit normal of an expression in x, y, z over a point file
+    too large for memory, optionally on several processes, with progress reporting and resumable runs.
+    """
+    def __init__(self, expression, quantity="gradient", chunk_size=1 << 20, dtype=np.float64):
+        """
+        Initialize with an expression, the quantity ("gradient", "norm" or "unit_normal"), the number of points
+        per chunk and the dtype of the output file.
+        """
+        if quantity not in QUANTITIES:
+            raise ValueError(f'''
+            Parameter - quantity supposed to be one of {sorted(QUANTITIES)}. But got {quantity}
+            ''')
+
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError(f'''
+            Parameter - chunk_size supposed to be a positive integer. But got {chunk_size}
+            ''')
+
+        self.expression = expression
+        self.quantity = quantity
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
+
+    def key(self, source, shape):
+        """
+        Return the fingerprint of a run, a saved progress file is only resumed by a run with the same fingerprint.
+        """
+        text = canonical([self.expression, self.quantity, os.path.abspath(source), list(shape), self.chunk_size, self.dtype.str])
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def save(path, state):
+        # Replace the progress file atomically, a crash leaves either the old or the new state
+        temporary = path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+
+    def __call__(self, source, target, workers=0, progress=None, resume=True):
+        """
+        Evaluate over the points in the .npy file 'source' and write the results to the .npy file 'target'.
+        'workers' > 0 spreads the chunks over that many processes, 'progress(done, total)' is called with the number
+        of finished points after every chunk. With 'resume' the chunks finished by an earlier, interrupted run are skipped.
+        Returns the output as a read-only memory map.
+        """
+        points = np.load(source, mmap_mode='r')
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f'''
+            The points in {source} supposed to be an array of shape (N, 3). But got {points.shape}
+            ''')
+
+        n = points.shape[0]
+        del points
+        chunks = [(start, min(start + self.chunk_size, n)) for start in range(0, n, self.chunk_size)]
+
+        state_path = target + ".progress.json"
+        key = self.key(source, (n, 3))
+        done = set()
+
+        if resume and os.path.exists(state_path) and os.path.exists(target):
+            with open(state_path) as file:
+                state = json.load(file)
+            if state.get("key") == key:
+                done = set(state["done"])
+
+        if not done:
+            columns = QUANTITIES[self.quantity]
+            np.lib.format.open_memmap(target, mode='w+', dtype=self.dtype, shape=(n, columns) if columns else (n,)).flush()
+
+        def finish(start, stop):
+            done.add(start // self.chunk_size)
+            self.save(state_path, {"key": key, "done": sorted(done)})
+            if progress is not None:
+                progress(sum(b - a for i, (a, b) in enumerate(chunks) if i in done), n)
+
+        pending = [chunk for i, chunk in enumerate(chunks) if i not in done]
+        self.save(state_path, {"key": key, "done": sorted(done)})
+
+        if workers:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_chunk, self.expression, self.quantity, source, target, start, stop)
+                           for start, stop in pending]
+                for future in concurrent.futures.as_completed(futures):
+                    finish(*future.result())
+        else:
+            for start, stop in pending:
+                finish(*_run_chunk(self.expression, self.quantity, source, target, start, stop))
+
+        # Complete, a later run starts from scratch
+        os.remove(state_path)
+        return np.load(target, mmap_mode='r')
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    from sympy.abc import x, y, z
+
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "points.npy")
+    points = np.lib.format.open_memmap(source, mode='w+', dtype=np.float32, shape=(1_000_000, 3))
+    points[:] = np.random.default_rng(0).uniform(-1, 1, size=points.shape)
+    points.flush()
+
+    def report(done, total):
+        print(f"\r{done}/{total} points", end="", file=sys.stderr)
+
+    # Unit normals of a sphere over one million points on two processes
+    stream = GradientFieldStream(x**2 + y**2 + z**2, "unit_normal", chunk_size=100_000)
+    normals = stream(source, os.path.join(directory, "normals.npy"), workers=2, progress=report)
+    print()
+    print(normals[:3])
@@ -0,0 +1,97 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Runs symbolic work (solve, integrate, ...) in a supervised child process with a wall-clock and memory limit.
+'''
+
+import multiprocessing
+import os
+import pickle
+import time
+
+try:
+    # Not available on Windows, memory limits are then ignored
+    import resource
+except ImportError:
+    resource = None
+
+class SupervisionError(Exception):
+    """
+    Raised when supervised work does not finish. 'result' is the structured result of supervise(), 'status'
+    one of "timeout", "memory" or "error".
+    """
+    def __init__(self, result):
+        super().__init__(f"{result['status']}: {result['error']}")
+        self.result = result
+        self.status = result["status"]
+
+def _address_space():
+    # Current virtual memory size of this process in bytes (Linux), 0 if unknown
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _supervised_worker(connection, memory_limit, function, args, kwargs):
+    # Runs in the child process: apply the memory limit, run the function and send back (status, value, error)
+    if memory_limit and resource is not None:
+        limit = _address_space() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        connection.send(("ok", function(*args, **kwargs), None))
+    except MemoryError:
+        connection.send(("memory", None, "memory limit exceeded"))
+    except Exception as exc:
+        try:
+            connection.send(("error", None, repr(exc)))
+        except Exception:
+            pass
+    finally:
+        connection.close()
+
+def supervise(function, *args, time_limit=None, memory_limit=None, start_method=None, **kwargs):
+    """
+    Run function(*args, **kwargs) in a child process that is killed after 'time_limit' seconds and may allocate
+    at most 'memory_limit' more bytes than its parent. The child is forked where possible, any other
+    'start_method' ("spawn", "forkserver") needs a picklable function and arguments: module-level functions
+    (the profiled sympy primitives of Profiling are), bound methods or functools.partial of them, no lambdas.
+    Returns {"status", "value", "seconds", "error"} where status is one of "ok", "timeout", "memory" or "error".
+    """
+    start = time.perf_counter()
+    if start_method is None:
+        start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else multiprocessing.get_start_method()
+
+    if start_method != "fork":
+        try:
+            pickle.dumps((function, args, kwargs))
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            raise TypeError(f'''
+            supervise() with the "{start_method}" start method needs a picklable function and arguments
+            (a module-level function, a bound method or a functools.partial, not a lambda or closure). {exc}
+            ''') from exc
+
+    context = multiprocessing.get_context(start_method)
+    receiver, sender = context.Pipe(duplex=False)
+    worker = context.Process(target=_supervised_worker, args=(sender, memory_limit, function, args, kwargs), daemon=True)
+    worker.start()
+    sender.close()
+
+    try:
+        if receiver.poll(time_limit):
+            status, value, error = receiver.recv()
+        else:
+            status, value, error = "timeout", None, f"no result within {time_limit} seconds"
+    except EOFError:
+        # The child died without answering, most likely killed for using too much memory
+        worker.join()
+        status, value, error = ("memory" if memory_limit else "error"), None, f"worker exited with code {worker.exitcode}"
+    finally:
+        if worker.is_alive():
+            worker.terminate()
+        worker.join()
+        receiver.close()
+
+    return {"status": status, "value": value, "seconds": time.perf_counter() - start, "error": error}
@@ -5,11 +5,24 @@
   last updated - Nov 8, 2023
 '''
 import sympy
-from sympy import simplify
 import math
+import functools
+import numpy as np
 from sympy.abc import x, y, z, l, L
-from sympy import pprint, Eq, solve, integrate
-from Differentiation import Differentiation
+from sympy import pprint, Eq
+
+try:
+    # Imported as part of the Algorithms package
+    from .Profiling import subs, solve, integrate
+    from .Simplification import simplify, using
+    from .Derivatives import Differentiation, TaylorExpansion, SparseDerivatives
+    from .Kernels import evaluate_kernel
+except ImportError:
+    # Run as a script from inside the Algorithms directory
+    from Profiling import subs, solve, integrate
+    from Simplification import simplify, using
+    from Derivatives import Differentiation, TaylorExpansion, SparseDerivatives
+    from Kernels import evaluate_kernel
 
 class MetaClass(type):
     """
@@ -117,21 +130,229 @@ class Vector:
             Something went wrong in finding out the unit vector
             ''')
 
+class VectorBatch:
+    """
+    This class represents N three-component vectors at once, backed by a single (N, 3) float array.
+    Every operation works on all N vectors in one vectorized call, slicing returns views that share memory.
+    """
+    def __init__(self, data):
+        """
+        Initialize from an (N, 3) array-like. A float64 array of that shape is used as is, without a copy.
+        """
+        data = np.asarray(data, dtype=float)
+
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError(f'''
+            VectorBatch supposed to be backed by an array of shape (N, 3). But got {data.shape}
+            ''')
+
+        self.data = data
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """
+        Build a batch from a list of Vector instances (their components have to be numeric).
+        """
+        if not all(isinstance(v, Vector) for v in vectors):
+            raise TypeError('''
+            All items supposed to be instances of Vector
+            ''')
+
+        return cls(np.array([v() for v in vectors], dtype=float).reshape(-1, 3))
+
+    def to_vectors(self):
+        """
+        Convert the batch back to a list of Vector instances.
+        """
+        return [Vector(*row) for row in self.data.tolist()]
+
+    def __str__(self):
+        return f"VectorBatch({len(self)} vectors)\n{self.data}"
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __call__(self, *args, **kwargs):
+        """
+        When an instance is called, return the underlying (N, 3) array.
+        """
+        return self.data
+
+    def __getitem__(self, index):
+        """
+        Slicing returns a VectorBatch view on the same memory, an integer index returns a single Vector.
+        """
+        if isinstance(index, (int, np.integer)):
+            return Vector(*self.data[index].tolist())
+
+        return VectorBatch(self.data[index])
+
+    def _operand(self, other):
+        # Accept another batch (or a single Vector) as the right-hand side of an element-wise operation
+        if isinstance(other, VectorBatch):
+            return other.data
+        if isinstance(other, Vector):
+            return np.array(other(), dtype=float)
+
+        raise ValueError(f'''
+        The following operation is not valid for the given data type ({type(other)}). It is supposed to be a type of VectorBatch
+        ''')
+
+    def __add__(self, other):
+        return VectorBatch(self.data + self._operand(other))
+
+    def __sub__(self, other):
+        return VectorBatch(self.data - self._operand(other))
+
+    def __mul__(self, other):
+        """
+        Multiply component-wise by another batch/Vector, or scale by a scalar or by one scalar per vector (shape (N,)).
+        """
+        if isinstance(other, (VectorBatch, Vector)):
+            return VectorBatch(self.data * self._operand(other))
+
+        factor = np.asarray(other, dtype=float)
+        return VectorBatch(self.data * (factor[:, None] if factor.ndim == 1 else factor))
+
+    __rmul__ = __mul__
+
+    def scale(self, factor):
+        """
+        Scale every vector by a scalar or by one scalar per vector.
+        """
+        return self * factor
+
+    def dot(self, other):
+        """
+        Return the (N,) array of dot products with another batch or a single Vector.
+        """
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(self._operand(other), self.data.shape))
+
+    def cross(self, other):
+        """
+        Return the batch of cross products with another batch or a single Vector.
+        """
+        return VectorBatch(np.cross(self.data, self._operand(other)))
+
+    def norm(self):
+        """
+        Return the (N,) array of magnitudes.
+        """
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def unit_vector(self):
+        """
+        Return the batch of unit vectors. Zero vectors have no direction and come back as rows of nan.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return VectorBatch(self.data / self.norm()[:, None])
+
+class FusedEvaluator:
+    """
+    This class compiles the value, the gradient and optionally the Hessian of an expression in x, y, z into one
+    numeric kernel. Common subexpressions (like sin(x*y) appearing in the value and in every derivative) are
+    eliminated across all outputs, so each is computed once per point. Use FusedEvaluator.of() to share one
+    compiled evaluator per expression.
+    """
+    variables = (x, y, z)
+
+    def __init__(self, expression, hessian=False):
+        """
+        Initialize with an expression, 'hessian' also compiles the six distinct second derivatives.
+        """
+        self.expression = expression
+        self.hessian = hessian
+
+        gradient = [Differentiation(expression, v).differentiate() for v in self.variables]
+        outputs = [expression] + gradient
+        if hessian:
+            outputs += [Differentiation(gradient[i], self.variables[j]).differentiate() for i in range(3) for j in range(i, 3)]
+
+        self.kernel = sympy.lambdify(self.variables, outputs, modules='numpy', cse=True)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def of(expression, hessian=False):
+        """
+        Return the shared compiled evaluator of an expression (an evaluator with the Hessian also serves value/gradient).
+        """
+        return FusedEvaluator(expression, hessian)
+
+    @classmethod
+    def point_array(cls, point, expression=None):
+        """
+        Convert a point dict like {'x':1,'y':2,'z':0} into a (1, 3) array. A missing coordinate is only allowed
+        (and taken as 0) when the expression does not depend on it.
+        """
+        free = sympy.sympify(expression).free_symbols if expression is not None else set(cls.variables)
+        row = []
+        for v in cls.variables:
+            value = point.get(str(v), point.get(v))
+            if value is None:
+                if v in free:
+                    raise ValueError(f'''
+                    The point {point} has no value for {v}
+                    ''')
+                value = 0
+            row.append(float(value))
+        return np.array([row])
+
+    def __call__(self, points):
+        """
+        Evaluate at an (N, 3) array of points (or a single point dict) and return
+        {"value": (N,), "gradient": (N, 3)} plus "hessian": (N, 3, 3) if it was compiled.
+        """
+        if isinstance(points, dict):
+            points = self.point_array(points, self.expression)
+
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f'''
+            Parameter - points supposed to be an array of shape (N, 3). But got {points.shape}
+            ''')
+
+        n = points.shape[0]
+        outputs = evaluate_kernel(self.kernel, points, 10 if self.hessian else 4)
+
+        result = {"value": outputs[:, 0], "gradient": outputs[:, 1:4]}
+
+        if self.hessian:
+            hessian = np.empty((n, 3, 3))
+            entries = iter(outputs[:, 4:].T)
+            for i in range(3):
+                for j in range(i, 3):
+                    hessian[:, i, j] = hessian[:, j, i] = next(entries)
+            result["hessian"] = hessian
+
+        return result
+
 class FindGradient:
     """
     This class is used for finding the gradient of a given mathematical expression.
     """
-    def __init__(self, expression, point=None):
+    def __init__(self, expression, point=None, variables=None):
         """
         Initialize with an expression. 'point' is optional and used for evaluating the gradient at a specific point.
+        'variables' (an ordered list of symbols) replaces x, y, z for models in any number of variables, the gradient
+        then comes back as a sympy SparseMatrix column holding only its structurally nonzero entries.
         """
         self.expression = expression
         self.point = point
+        self.variables = list(variables) if variables else None
+        self.derivatives = SparseDerivatives(expression, self.variables) if self.variables else None
+        self.kernel = None
 
-    def __call__(self, *args, **kwargs):
+    def __call__(self, *args, backend="symbolic", **kwargs):
         """
         Calculate the gradient of the expression. This is done by differentiating the expression with respect to x, y, and z.
+        With backend="compiled" and a point, the gradient is evaluated numerically by the shared FusedEvaluator.
         """
+        if self.derivatives is not None:
+            return self.derivatives.gradient_matrix(self.point)
+
+        if backend == "compiled" and self.point:
+            return Vector(*FusedEvaluator.of(self.expression)(self.point)["gradient"][0].tolist())
+
         # Differentiate the expression with respect to x, y, and z.
         diffx = Differentiation(self.expression, x)
         diffy = Differentiation(self.expression, y)
@@ -145,13 +366,41 @@ class FindGradient:
         # If a point is provided, substitute it into the components.
         if self.point:
             try:
-                return Vector(x_component.subs(self.point), y_component.subs(self.point), z_component.subs(self.point))
+                return Vector(subs(x_component, self.point), subs(y_component, self.point), subs(z_component, self.point))
             except:
                 return Vector(x_component, y_component, z_component)
 
         vector = Vector(x_component, y_component, z_component)
         return vector
 
+    def compile(self):
+        """
+        Differentiate the expression once and compile the three gradient components into a vectorized numeric kernel.
+        The kernel is kept on the object so repeated batch evaluations skip the symbolic work entirely.
+        """
+        if self.kernel is None:
+            components = [Differentiation(self.expression, symbol).differentiate() for symbol in (x, y, z)]
+            self.kernel = sympy.lambdify((x, y, z), components, modules='numpy', cse=True)
+
+        return self.kernel
+
+    def batch(self, points):
+        """
+        Evaluate the gradient at an (N, 3) array of points (columns x, y, z) in one call and return an (N, 3) array.
+        With variables the points are (N, n) and the result is (N, n).
+        """
+        if self.derivatives is not None:
+            return self.derivatives.evaluate(points)["gradient"]
+
+        points = np.asarray(points, dtype=float)
+
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f'''
+            Parameter - points supposed to be an array of shape (N, 3). But got {points.shape}
+            ''')
+
+        return evaluate_kernel(self.compile(), points, 3)
+
     def find_direction(self, point):
         """
         Find the direction of steepest ascent at a given point.
@@ -160,10 +409,14 @@ class FindGradient:
             raise TypeError(f'''
             Parameter - point got wrong data type supposed to be a dict. But got {type(point)}
             ''')
+        if self.derivatives is not None:
+            # With variables the gradient is a SparseMatrix column, its length comes from the dot product
+            gradient = self.derivatives.gradient_matrix(point)
+            return sympy.sqrt(gradient.dot(gradient))
         try:
             v = self() * self()
             try:
-               mod = sympy.sqrt(sum(v())).subs(point)
+               mod = subs(sympy.sqrt(sum(v())), point)
             except:
                 mod = sympy.sqrt(sum(v()))
             return mod
@@ -185,10 +438,18 @@ class FindUnitNormalVector:
         self.expression = expression
         self.point = point
 
-    def __call__(self, *args, **kwargs):
+    def __call__(self, *args, backend="symbolic", **kwargs):
         """
-        Calculate the unit normal vector.
+        Calculate the unit normal vector, a ValueError is raised where the gradient vanishes (no normal exists).
+        With backend="compiled" it is evaluated numerically by the shared FusedEvaluator.
         """
+        if backend == "compiled":
+            gradient = FusedEvaluator.of(self.expression)(self.point)["gradient"][0]
+            length = np.linalg.norm(gradient)
+            if not length > 0:
+                self._degenerate()
+            return Vector(*(gradient / length).tolist())
+
         g = FindGradient(expression=self.expression)
 
         # Get the gradient vector
@@ -196,23 +457,33 @@ class FindUnitNormalVector:
 
         try:
             # Calculate the magnitude of the gradient vector
-            sqrt = math.sqrt(sum([i.subs(self.point)**2 if not isinstance(i, int or float) else i for i in get_gradient()]))
+            sqrt = math.sqrt(sum([subs(i, self.point)**2 if not isinstance(i, int or float) else i for i in get_gradient()]))
         except:
             # If the above fails (likely due to symbolic variables), use sympy's sqrt
-            sqrt = sympy.sqrt(sum([i.subs(self.point)**2 if not isinstance(i, int or float) else i  for i in get_gradient()]))
+            sqrt = sympy.sqrt(sum([subs(i, self.point)**2 if not isinstance(i, int or float) else i  for i in get_gradient()]))
+
+        if sqrt == 0:
+            self._degenerate()
 
         components = []
 
         # Normalize each component of the gradient vector to get the unit normal vector
         for item in get_gradient():
-            components.append(item.subs(self.point) / sqrt)
+            components.append(subs(item, self.point) / sqrt)
 
         return Vector(*components)
 
+    def _degenerate(self):
+        # At a singular point of the surface the gradient vanishes and has no direction to normalize
+        raise ValueError(f'''
+        The gradient of {self.expression} vanishes at {self.point}, there is no unit normal vector there
+        ''')
+
 class TangentPlane:
-    def __init__(self, expression, point):
+    def __init__(self, expression, point, variables=None):
         """
         Initialize with an expression representing a surface and a point.
+        'variables' (an ordered list of symbols) replaces x, y, z for hypersurfaces in any number of variables.
         """
         if not isinstance(point, dict):
             raise TypeError(f'''
@@ -221,13 +492,25 @@ class TangentPlane:
 
         self.expression = expression
         self.point = point
+        self.variables = list(variables) if variables else None
 
-    def __call__(self, *args, **kwargs):
+    def __call__(self, *args, backend="symbolic", **kwargs):
         """
         Calculate the equation of the tangent plane at a given point.
+        With backend="compiled" the gradient is evaluated numerically by the shared FusedEvaluator.
         """
+        if self.variables:
+            # Only the structurally nonzero gradient entries contribute a term
+            gradient = SparseDerivatives(self.expression, self.variables).gradient()
+            at = {v: self.point[v] if v in self.point else self.point[str(v)] for v in self.variables}
+            return sympy.Add(*[subs(g, self.point) * (self.variables[i] - at[self.variables[i]]) for i, g in gradient.items()])
+
         vector = Vector(x, y, z)
 
+        if backend == "compiled":
+            diffx, diffy, diffz = FusedEvaluator.of(self.expression)(self.point)["gradient"][0].tolist()
+            return diffx * (x - self.point['x']) + diffy * (y - self.point['y']) + diffz * (z - self.point['z'])
+
         # Differentiating the expression with respect to x, y, and z.
         diffx = Differentiation(self.expression, x).differentiate(self.point)
         diffy = Differentiation(self.expression, y).differentiate(self.point)
@@ -244,16 +527,119 @@ class TangentPlane:
         """
         Perform a linear approximation of the function at a given point.
         """
-        func = self.expression.subs(self.point) if not isinstance(self.expression, (int, float)) else self.expression
+        func = subs(self.expression, self.point) if not isinstance(self.expression, (int, float)) else self.expression
 
         try:
             if approx_point:
                pprint(func)
-               return (self(self.expression, self.point)() + func).subs(approx_point)
+               return subs(self(self.expression, self.point)() + func, approx_point)
             raise ValueError('Something went wrong! ')
         except:
             return TangentPlane(self.expression, self.point)() + func
 
+    def taylor_approximation(self, order=2):
+        """
+        Return the Taylor expansion of the surface around the point up to the given order, the order-1 case is
+        the linear approximation. Call the result on an (N, 3) array to evaluate it at many points.
+        """
+        return TaylorExpansion(self.expression, self.point, order, variables=[x, y, z])
+
+class SurfaceMesh:
+    """
+    This class computes the unit normals and tangent planes of the implicit surface expression(x, y, z) = c at every
+    vertex of a mesh. Vertices are read from, and results written into, caller-provided float buffers (numpy arrays,
+    memoryviews, np.memmap) chunk by chunk, so no array the size of the mesh is ever allocated or copied.
+    """
+    def __init__(self, expression, chunk_size=65536, tolerance=1e-12, degenerate="nan"):
+        """
+        Initialize with the surface expression. Vertices whose gradient norm is at most 'tolerance' have no normal,
+        'degenerate' decides what is written for them: "nan", "zero" or "raise" (ValueError).
+        """
+        if degenerate not in ("nan", "zero", "raise"):
+            raise ValueError(f'''
+            Parameter - degenerate supposed to be "nan", "zero" or "raise". But got {degenerate}
+            ''')
+
+        self.expression = expression
+        self.gradient = FindGradient(expression)
+        self.chunk_size = chunk_size
+        self.tolerance = tolerance
+        self.degenerate = degenerate
+
+    @staticmethod
+    def view(buffer, columns, rows=None, writable=False):
+        """
+        Return an (N, columns) view of a contiguous float buffer. Raises instead of copying.
+        """
+        array = np.asarray(buffer)
+
+        if array.dtype.kind != 'f':
+            raise TypeError(f'''
+            The buffer supposed to hold floats. But got {array.dtype}
+            ''')
+
+        if not array.flags.c_contiguous or (writable and not array.flags.writeable):
+            raise ValueError(f'''
+            The buffer supposed to be contiguous{" and writable" if writable else ""}
+            ''')
+
+        if array.size % columns or (rows is not None and array.size != rows * columns):
+            raise ValueError(f'''
+            The buffer of {array.size} floats does not hold {rows if rows is not None else "whole"} rows of {columns}
+            ''')
+
+        return array.reshape(-1, columns)
+
+    def __call__(self, vertices, normals=None, planes=None):
+        """
+        Compute the normals (N, 3) and the tangent planes (N, 4) as coefficients (a, b, c, d) of a*x + b*y + c*z + d = 0,
+        with (a, b, c) the unit normal. 'vertices' holds N*3 floats (x, y, z per vertex). 'normals' and 'planes' are
+        optional output buffers of N*3 and N*4 floats; without either one a normals array is allocated.
+        Returns {"normals", "planes", "degenerate": indices of the zero-gradient vertices}.
+        """
+        points = self.view(vertices, 3)
+        n = len(points)
+
+        if normals is not None:
+            normals = self.view(normals, 3, n, writable=True)
+        if planes is not None:
+            planes = self.view(planes, 4, n, writable=True)
+        if normals is None and planes is None:
+            normals = np.empty((n, 3))
+
+        kernel = self.gradient.compile()
+        degenerate = []
+
+        for start in range(0, n, self.chunk_size):
+            stop = min(start + self.chunk_size, n)
+            chunk = points[start:stop]
+            # Without a normals buffer the normals are built in place in the first three columns of the planes
+            out = normals[start:stop] if normals is not None else planes[start:stop, :3]
+
+            for i, component in enumerate(kernel(chunk[:, 0], chunk[:, 1], chunk[:, 2])):
+                out[:, i] = component
+
+            length = np.sqrt(np.einsum('ij,ij->i', out, out))
+            bad = ~(length > self.tolerance)
+            np.divide(out, length[:, None], out=out, where=~bad[:, None])
+
+            if bad.any():
+                indices = np.flatnonzero(bad) + start
+                if self.degenerate == "raise":
+                    raise ValueError(f'''
+                    The gradient of {self.expression} vanishes at the vertices {indices.tolist()[:10]}
+                    ''')
+                out[bad] = np.nan if self.degenerate == "nan" else 0.0
+                degenerate.append(indices)
+
+            if planes is not None:
+                if normals is not None:
+                    planes[start:stop, :3] = out
+                planes[start:stop, 3] = -np.einsum('ij,ij->i', out, chunk)
+
+        return {"normals": normals if normals is not None else planes[:, :3], "planes": planes,
+                "degenerate": np.concatenate(degenerate) if degenerate else np.empty(0, dtype=int)}
+
 class DirectionalDerivative():
     def __init__(self, expression, point, vector=Vector, angle=None):
         """
@@ -268,10 +654,16 @@ class DirectionalDerivative():
         self.vector = vector if not angle else Vector(sympy.cos(angle), sympy.sin(angle))
         self.point = point
 
-    def __call__(self):
+    def __call__(self, backend="symbolic"):
         """
         Calculate the directional derivative.
+        With backend="compiled" the gradient is evaluated numerically by the shared FusedEvaluator.
         """
+        if backend == "compiled":
+            gradient = FusedEvaluator.of(self.expression)(self.point)["gradient"][0]
+            direction = np.array([float(c) for c in self.vector()])
+            return float(gradient @ direction / np.linalg.norm(direction))
+
         # Differentiating the expression with respect to x, y, and z.
         diffx = Differentiation(self.expression, x).differentiate(self.point)
         diffy = Differentiation(self.expression, y).differentiate(self.point)
@@ -287,6 +679,52 @@ class DirectionalDerivative():
         except:
             return sum(v())
 
+    @staticmethod
+    def directions(directions=None, angles=None):
+        """
+        Return the unit directions as a (K, 3) array, from K vectors (Vector objects or rows of 2 or 3 components)
+        or from K angles in the xy-plane.
+        """
+        if angles is not None:
+            angles = np.atleast_1d(np.asarray(angles, dtype=float))
+            return np.stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=1)
+
+        rows = [[float(c) for c in d()] if isinstance(d, Vector) else d for d in directions]
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))
+        if rows.ndim != 2 or rows.shape[1] not in (2, 3):
+            raise ValueError(f'''
+            Parameter - directions supposed to be K vectors of 2 or 3 components. But got shape {rows.shape}
+            ''')
+
+        units = np.zeros((rows.shape[0], 3))
+        units[:, :rows.shape[1]] = rows
+        lengths = np.linalg.norm(units, axis=1)
+        if not np.all(lengths > 0):
+            raise ValueError(f'''
+            The directions {np.flatnonzero(lengths == 0).tolist()} have zero length
+            ''')
+
+        return units / lengths[:, None]
+
+    @staticmethod
+    def batch(expression, points, directions=None, angles=None):
+        """
+        Return the (M, K) matrix of directional derivatives of the expression at M points (an (M, 3) array or
+        a list of point dicts) along K directions (vectors or angles, see directions()).
+        The gradient is evaluated once per point by the shared FusedEvaluator.
+        """
+        if (directions is None) == (angles is None):
+            raise ValueError('''
+            Give either directions or angles
+            ''')
+
+        evaluator = FusedEvaluator.of(expression)
+        if not isinstance(points, np.ndarray) and points and isinstance(points[0], dict):
+            points = np.concatenate([evaluator.point_array(p, expression) for p in points])
+
+        gradient = evaluator(points)["gradient"]
+        return gradient @ DirectionalDerivative.directions(directions, angles).T
+
 
 if __name__ == "__main__":
     #maximim rate of change -> steepest_direction()
@@ -298,3 +736,29 @@ if __name__ == "__main__":
 
     pprint(FindGradient(expr).find_direction(point))
 
+    # Evaluate the gradient field over many points at once
+    points = np.random.default_rng(0).uniform(-1, 1, size=(100000, 3))
+    print(FindGradient(expr).batch(points)[:3])
+
+    # Directional derivatives at many points along a fan of 8 directions, one gradient evaluation per point
+    print(DirectionalDerivative.batch(expr, points[:4], angles=np.linspace(0, 2 * np.pi, 8, endpoint=False)))
+
+    # Unit normals and tangent planes of the unit sphere for a whole vertex buffer, written into preallocated planes
+    sphere = SurfaceMesh(x**2 + y**2 + z**2)
+    planes = np.empty((len(points), 4))
+    sphere(points, planes=planes)
+    print(planes[:2])
+
+    # Skip simplification when the tangent plane goes straight into numeric evaluation
+    with using("off"):
+        pprint(TangentPlane(expr, point)())
+    pprint(TangentPlane(expr, point)())
+
+    # Value, gradient and Hessian from one compiled kernel, the geometry classes can use it as their backend
+    pprint(FusedEvaluator.of(expr, hessian=True)(points[:2]))
+    pprint(TangentPlane(expr, point)(backend="compiled"))
+
+    # Operate on all the sample vectors at once
+    batch = VectorBatch(points)
+    print(batch.cross(v).unit_vector()[:3], batch.dot(v)[:3])
+
@@ -0,0 +1,71 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Package API of the multivariable calculus toolkit, like:
+
+      from Algorithms import FindGradient, TangentPlane
+
+  The submodules (and with them sympy and numpy) are only imported when one of their names is first used,
+  so importing the package itself is cheap for short-lived workers.
+'''
+
+import importlib
+
+# Public name -> submodule that defines it
+_exports = {
+    "Differentiation": "Derivatives",
+    "DerivativeCache": "Derivatives",
+    "derivative_cache": "Derivatives",
+    "Second_derivative_test": "Derivatives",
+    "SparseDerivatives": "Derivatives",
+    "HessianTest": "Derivatives",
+    "Absolute_Values": "Derivatives",
+    "FindCriticalPoints": "Derivatives",
+    "TaylorExpansion": "Derivatives",
+    "ForwardModeAD": "Automatic_differentiation",
+    "Equation": "Equations",
+    "EquationSolver": "Equations",
+    "NewtonSolver": "Equations",
+    "CompiledRegion": "Multivarible_Integration",
+    "AdaptiveCubature": "Multivarible_Integration",
+    "QuasiMonteCarloIntegration": "Multivarible_Integration",
+    "IntegrationPlanner": "Multivarible_Integration",
+    "PartialIntegralCache": "Multivarible_Integration",
+    "partial_integral_cache": "Multivarible_Integration",
+    "MultivariableIntegration": "Multivarible_Integration",
+    "Vector": "Vector_tools",
+    "VectorBatch": "Vector_tools",
+    "FusedEvaluator": "Vector_tools",
+    "FindGradient": "Vector_tools",
+    "FindUnitNormalVector": "Vector_tools",
+    "TangentPlane": "Vector_tools",
+    "SurfaceMesh": "Vector_tools",
+    "DirectionalDerivative": "Vector_tools",
+    "GradientFieldStream": "Streaming",
+    "GradientOptimizer": "Optimization",
+    "SymbolicProfiler": "Profiling",
+    "profiler": "Profiling",
+    "SimplificationPolicy": "Simplification",
+    "set_policy": "Simplification",
+    "get_policy": "Simplification",
+    "using": "Simplification",
+    "canonical": "Simplification",
+    "supervise": "Supervisor",
+    "SupervisionError": "Supervisor",
+    "PersistentCache": "Persistent_cache",
+}
+
+__all__ = sorted(_exports)
+
+def __getattr__(name):
+    # Import the defining submodule on first access and cache the attribute on the package
+    if name in _exports:
+        value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
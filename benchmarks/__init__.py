@@ -0,0 +1,4 @@
+'''
+  Benchmarks for the Algorithms package.
+  Run with: python -m benchmarks.bench_algorithms --help
+'''
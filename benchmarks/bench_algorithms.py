@@ -0,0 +1,261 @@
+'''
+  Scaling benchmarks for every public class of the Algorithms package.
+
+  Each benchmark is timed over growing expression sizes or point counts and records wall time and
+  peak traced memory. The "import" benchmark measures the import time of the package in a fresh interpreter
+  and checks it against IMPORT_BUDGETS, relative to importing numpy and sympy on the same machine. Results are written as JSON lines so that two runs can be compared:
+
+      python -m benchmarks.bench_algorithms --output base.jsonl
+      python -m benchmarks.bench_algorithms --compare base.jsonl
+'''
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import sympy
+from sympy.abc import x, y, z
+
+from Algorithms import Differentiation
+from Algorithms import (Second_derivative_test, Absolute_Values, FindCriticalPoints, derivative_cache,
+                        Equation, EquationSolver, MultivariableIntegration, Vector, FindGradient, FindUnitNormalVector,
+                        TangentPlane, DirectionalDerivative, FusedEvaluator, partial_integral_cache)
+from Algorithms import Persistent_cache
+
+# Import statement -> budget as a multiple of the time of IMPORT_REFERENCE (best of three fresh interpreters
+# each), so that the budgets hold on slow and fast machines alike. The bare package must stay cheap.
+IMPORT_REFERENCE = "import numpy, sympy"
+IMPORT_BUDGETS = {
+    "import Algorithms": 0.05,
+    "from Algorithms import FindGradient": 1.5,
+}
+
+
+def surface(n):
+    # An expression with n terms mixing polynomial and trigonometric parts
+    return sum((k * x**k * y + sympy.sin(k * x * z) + y**2 * z / k) for k in range(1, n + 1))
+
+
+def quadratic(n):
+    # A concave quadratic in x and y with n terms, it has a single critical point
+    return sum(-(x - k)**2 - k * (y + k)**2 + x * y / (k + 2) for k in range(1, n + 1))
+
+
+def points(n, seed=0):
+    # n random points as dicts in [-1, 1]^3
+    values = np.random.default_rng(seed).uniform(-1, 1, size=(n, 3))
+    return [{'x': a, 'y': b, 'z': c} for a, b, c in values.tolist()]
+
+
+def bench_differentiation(n):
+    expression = surface(n)
+    return lambda: [Differentiation(expression, s).differentiate() for s in (x, y, z)]
+
+
+def bench_second_derivative_test(n):
+    expression = quadratic(n)
+    critical_points = FindCriticalPoints(expression)()
+    return lambda: Second_derivative_test(expression, critical_points)()
+
+
+def bench_absolute_values(n):
+    expression = surface(3)
+    candidates = points(n)
+    return lambda: Absolute_Values(expression, candidates)()
+
+
+def bench_find_critical_points(n):
+    expression = quadratic(n)
+    return lambda: FindCriticalPoints(expression)()
+
+
+def bench_equation_solver(n):
+    rng = np.random.default_rng(n)
+    systems = []
+    for _ in range(n):
+        a = rng.integers(1, 9, size=(3, 3)) + 9 * np.eye(3, dtype=int)
+        b = rng.integers(-9, 9, size=3)
+        systems.append([Equation(sympy.Eq(int(r[0]) * x + int(r[1]) * y + int(r[2]) * z, int(c))) for r, c in zip(a, b)])
+    return lambda: [EquationSolver(system)() for system in systems]
+
+
+def bench_multivariable_integration(n):
+    expression = sum(x**k * y + z**k / (k + 1) for k in range(1, n + 1))
+    limit = [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": 2}}, {"z": {"a": -1, "b": 1}}]
+    return lambda: MultivariableIntegration().solve_multiple_integral(expression, limit)
+
+
+def bench_find_gradient(n):
+    expression = surface(3)
+    candidates = points(n)
+    return lambda: [FindGradient(expression, p)() for p in candidates]
+
+
+def bench_find_gradient_batch(n):
+    expression = surface(3)
+    array = np.random.default_rng(0).uniform(-1, 1, size=(n, 3))
+    return lambda: FindGradient(expression).batch(array)
+
+
+def bench_find_unit_normal_vector(n):
+    expression = x**2 + y**2 + z**2 + sympy.sin(x * y)
+    candidates = points(n)
+    return lambda: [FindUnitNormalVector(expression, p)() for p in candidates]
+
+
+def bench_tangent_plane(n):
+    expression = surface(n)
+    point = {'x': 0.5, 'y': -0.25, 'z': 1}
+    return lambda: TangentPlane(expression, point)()
+
+
+def bench_directional_derivative(n):
+    expression = surface(n)
+    point = {'x': 0.5, 'y': -0.25, 'z': 1}
+    return lambda: DirectionalDerivative(expression, point, Vector(1, 2, 2))()
+
+
+# name -> (setup function returning the callable to time, full sizes, quick sizes)
+BENCHMARKS = {
+    "Differentiation": (bench_differentiation, [2, 8, 32, 128], [2, 8]),
+    "Second_derivative_test": (bench_second_derivative_test, [2, 8, 32], [2, 4]),
+    "Absolute_Values": (bench_absolute_values, [10, 100, 1000], [10, 50]),
+    "FindCriticalPoints": (bench_find_critical_points, [2, 8, 32], [2, 4]),
+    "EquationSolver": (bench_equation_solver, [1, 10, 100], [1, 5]),
+    "MultivariableIntegration": (bench_multivariable_integration, [1, 4, 16], [1, 2]),
+    "FindGradient": (bench_find_gradient, [10, 100, 1000], [10, 50]),
+    "FindGradient.batch": (bench_find_gradient_batch, [10**3, 10**4, 10**5, 10**6], [10**3, 10**4]),
+    "FindUnitNormalVector": (bench_find_unit_normal_vector, [10, 100, 1000], [10, 50]),
+    "TangentPlane": (bench_tangent_plane, [2, 8, 32, 128], [2, 8]),
+    "DirectionalDerivative": (bench_directional_derivative, [2, 8, 32, 128], [2, 8]),
+}
+
+
+def measure_import(statement, repeat):
+    # Best time of 'statement' over 'repeat' fresh interpreters, so nothing is already in sys.modules
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    best = float("inf")
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        best = min(best, float(output.stdout))
+    return best
+
+
+def clear_caches():
+    # Forget every in-memory result so that the next run starts cold
+    derivative_cache.clear()
+    partial_integral_cache.clear()
+    FusedEvaluator.of.cache_clear()
+
+
+def measure(function, repeat):
+    # Best wall time over 'repeat' cold runs (in-memory caches cleared, the persistent cache switched off)
+    # and the peak traced memory of one run
+    best = float("inf")
+    with Persistent_cache.disabled():
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+
+        clear_caches()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return best, peak
+
+
+def run(names, quick=False, repeat=3):
+    """
+    Run the selected benchmarks and yield one result record per (benchmark, size).
+    """
+    environment = {"python": platform.python_version(), "sympy": sympy.__version__, "numpy": np.__version__}
+
+    for name in names:
+        if name == "import":
+            reference = measure_import(IMPORT_REFERENCE, max(repeat, 3))
+            for statement, budget in IMPORT_BUDGETS.items():
+                seconds = measure_import(statement, max(repeat, 3))
+                yield {"benchmark": name, "size": statement, "seconds": seconds, "reference_seconds": reference,
+                       "ratio": seconds / reference, "budget_ratio": budget,
+                       "within_budget": seconds <= budget * reference, **environment}
+            continue
+
+        setup, sizes, quick_sizes = BENCHMARKS[name]
+        for size in (quick_sizes if quick else sizes):
+            seconds, peak = measure(setup(size), repeat)
+            yield {"benchmark": name, "size": size, "seconds": seconds, "peak_bytes": peak, **environment}
+
+
+def compare(results, baseline_path, threshold):
+    """
+    Return the results that are slower than the baseline run by more than 'threshold' (a ratio, 0.25 = 25 %).
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = {(r["benchmark"], r["size"]): r for r in map(json.loads, baseline_file) if r.get("benchmark")}
+
+    regressions = []
+    for result in results:
+        before = baseline.get((result["benchmark"], result["size"]))
+        if before and result["seconds"] > before["seconds"] * (1 + threshold):
+            regressions.append({**result, "baseline_seconds": before["seconds"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for the Algorithms package.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)", metavar="name")
+    parser.add_argument("--quick", action="store_true", help="run only the small sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size, the best one is kept")
+    parser.add_argument("--output", help="write the JSON lines to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON lines of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio for --compare")
+    parser.add_argument("--list", action="store_true", help="list the available benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(["import"] + list(BENCHMARKS)))
+        return 0
+
+    unknown = [n for n in args.names if n != "import" and n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks {unknown}, use --list")
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    results = []
+    try:
+        for result in run(args.names or ["import"] + list(BENCHMARKS), args.quick, args.repeat):
+            results.append(result)
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    over_budget = [r for r in results if r.get("within_budget") is False]
+    for result in over_budget:
+        print(json.dumps({"over_budget": result}), file=sys.stderr)
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    for regression in regressions:
+        print(json.dumps({"regression": regression}), file=sys.stderr)
+
+    return 1 if regressions or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Streaming batch runner. Reads JSON-lines jobs from a file or stdin, runs them on a process pool
+  and writes one JSON-lines result per job, in input order unless --unordered is given.
+
+      python main.py jobs.jsonl --workers 4 > results.jsonl
+
+  A job names an operation and its arguments, expressions are strings in sympy syntax (arithmetic, symbols and
+  the FUNCTIONS below, nothing is eval'd), for example:
+
+      {"id": 1, "op": "gradient", "expression": "3*x*sin(x*y)", "point": {"x": 4, "y": 1, "z": 0}}
+      {"id": 2, "op": "multiple_integral", "expression": "x*y", "limit": [{"x": {"a": 0, "b": "y"}}, {"y": {"a": 0, "b": 1}}]}
+
+  Every result looks like {"id": ..., "ok": true, "result": ...} or {"id": ..., "ok": false, "error": "..."}.
+'''
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import sys
+
+
+def to_json(value):
+    """
+    Convert a result (sympy expressions, numpy arrays, Vectors, nested containers) into JSON-ready data.
+    Numeric sympy values become floats, everything else symbolic becomes its string form.
+    """
+    import numpy as np
+    import sympy
+    from Algorithms import Vector
+
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, Vector):
+        return to_json(value())
+    if isinstance(value, np.ndarray):
+        return to_json(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, sympy.Basic):
+        if value.is_number:
+            try:
+                return float(value)
+            except TypeError:
+                return str(value)
+        return str(value)
+    return value
+
+
+# Functions and constants an expression may name, any other name is a symbol
+FUNCTIONS = (
+    "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "atan2", "acot",
+    "sinh", "cosh", "tanh", "coth", "asinh", "acosh", "atanh",
+    "exp", "log", "ln", "sqrt", "root", "cbrt", "Abs", "sign", "floor", "ceiling", "Min", "Max",
+    "factorial", "gamma", "erf", "erfc", "Heaviside", "pi", "E", "I", "oo",
+)
+
+# Tokens an expression may contain besides numbers and names: arithmetic, calls and "^" for powers
+OPERATORS = {"+", "-", "*", "/", "**", "^", "(", ")", ","}
+
+
+def parse_expression(value):
+    """
+    Parse a number or an expression string of a job. sympify would eval the string, so only numbers, names,
+    arithmetic and calls are accepted, and the names resolve to the FUNCTIONS or to symbols, nothing else.
+    """
+    import io
+    import keyword
+    import tokenize
+    import sympy
+    from sympy.parsing.sympy_parser import convert_xor, parse_expr, standard_transformations
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return sympy.sympify(value)
+    if not isinstance(value, str):
+        raise ValueError(f"expected a number or an expression string, got {value!r}")
+
+    text = value.strip()
+    for token in tokenize.generate_tokens(io.StringIO(text).readline):
+        allowed = (token.type == tokenize.NUMBER
+                   or token.type == tokenize.NAME and not keyword.iskeyword(token.string) and not token.string.startswith("_")
+                   or token.type == tokenize.OP and token.string in OPERATORS
+                   or token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER))
+        if not allowed:
+            raise ValueError(f"unsupported {token.string!r} in expression {text!r}")
+
+    namespace = {"__builtins__": {}, "Integer": sympy.Integer, "Float": sympy.Float, "Rational": sympy.Rational,
+                 "Symbol": sympy.Symbol, "Function": sympy.Function}
+    namespace.update((name, getattr(sympy, "log" if name == "ln" else name)) for name in FUNCTIONS)
+    return parse_expr(text, local_dict={}, global_dict=namespace,
+                      transformations=standard_transformations + (convert_xor,))
+
+
+def parse_point(point):
+    # {"x": "pi/2", "y": 1} -> {"x": pi/2, "y": 1}
+    return {k: parse_expression(v) for k, v in point.items()}
+
+
+def parse_direction(job):
+    """
+    The direction of a single-point "directional_derivative" job as a Vector: the unit vector at "angle" in the
+    xy-plane, or "vector" (default [1, 0, 0]) when there is no angle or it is 0.
+    """
+    import sympy
+    from Algorithms import Vector
+    angle = parse_expression(job["angle"]) if "angle" in job else None
+    if angle:
+        return Vector(sympy.cos(angle), sympy.sin(angle))
+    return Vector(*[parse_expression(c) for c in job.get("vector", [1, 0, 0])])
+
+
+def op_differentiate(job, expression):
+    from Algorithms import Differentiation
+    import sympy
+    diff = Differentiation(expression, sympy.Symbol(job.get("symbol", "x")))
+    order = job.get("order", 1)
+    return diff.nth_differentiation(order) if order > 1 else diff.differentiate(parse_point(job.get("point", {})))
+
+
+def op_gradient(job, expression):
+    from Algorithms import FindGradient
+    if "points" in job:
+        return FindGradient(expression).batch(job["points"])
+    return FindGradient(expression, parse_point(job["point"]) if "point" in job else None)()
+
+
+def op_unit_normal(job, expression):
+    from Algorithms import FindUnitNormalVector
+    return FindUnitNormalVector(expression, parse_point(job["point"]))()
+
+
+def op_tangent_plane(job, expression):
+    from Algorithms import TangentPlane
+    return TangentPlane(expression, parse_point(job["point"]))()
+
+
+def op_directional_derivative(job, expression):
+    from Algorithms import DirectionalDerivative
+    if "points" in job:
+        # Batched: {"points": [[x, y, z], ...], "vectors": [[1, 0], ...]} or "angles": ["pi/4", ...]
+        angles = [float(parse_expression(a)) for a in job["angles"]] if "angles" in job else None
+        return DirectionalDerivative.batch(expression, job["points"], job.get("vectors"), angles)
+    return DirectionalDerivative(expression, parse_point(job["point"]), parse_direction(job))()
+
+
+def op_critical_points(job, expression):
+    from Algorithms import FindCriticalPoints
+    return FindCriticalPoints(expression)(**job.get("options", {}))
+
+
+def op_classify(job, expression):
+    from Algorithms import HessianTest
+    import sympy
+    variables = [sympy.Symbol(v) for v in job["variables"]] if "variables" in job else None
+    result = HessianTest(expression, variables)(job["points"])
+    return {"labels": result["labels"], "eigenvalues": result["eigenvalues"]}
+
+
+def op_multiple_integral(job, expression):
+    from Algorithms import MultivariableIntegration
+    limit = [{k: {"a": parse_expression(v["a"]), "b": parse_expression(v["b"])} for k, v in item.items()}
+             for item in job["limit"]]
+    return MultivariableIntegration().solve_multiple_integral(expression, limit, **job.get("options", {}))
+
+
+def op_solve(job, expression):
+    from Algorithms import Equation, EquationSolver
+    import sympy
+    equations = []
+    for text in job["equations"]:
+        lhs, _, rhs = text.partition("=")
+        equations.append(Equation(sympy.Eq(parse_expression(lhs), parse_expression(rhs or "0"))))
+    return EquationSolver(equations)(**job.get("options", {}))
+
+
+# Operation name -> handler(job, expression). "solve" takes its equations from the job instead of an expression.
+OPERATIONS = {
+    "differentiate": op_differentiate,
+    "gradient": op_gradient,
+    "unit_normal": op_unit_normal,
+    "tangent_plane": op_tangent_plane,
+    "directional_derivative": op_directional_derivative,
+    "critical_points": op_critical_points,
+    "classify": op_classify,
+    "multiple_integral": op_multiple_integral,
+    "solve": op_solve,
+}
+
+
+def run_job(line):
+    """
+    Run one JSON-lines job and return its result line. Never raises, failures are reported in the result.
+    """
+    job_id = None
+    try:
+        job = json.loads(line)
+        job_id = job.get("id")
+
+        if job.get("op") not in OPERATIONS:
+            raise ValueError(f"unknown op {job.get('op')!r}, expected one of {sorted(OPERATIONS)}")
+
+        expression = parse_expression(job["expression"]) if "expression" in job else None
+        result = {"id": job_id, "ok": True, "result": to_json(OPERATIONS[job["op"]](job, expression))}
+    except Exception as exc:
+        result = {"id": job_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    return json.dumps(result)
+
+
+def jobs(stream):
+    # Non-empty lines of the input, read lazily
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def run_serial(lines):
+    for line in lines:
+        yield run_job(line)
+
+
+def run_pool(lines, workers, max_in_flight, ordered=True):
+    """
+    Run the jobs on a process pool with at most 'max_in_flight' submitted and unfinished jobs,
+    yielding result lines in input order (or as they complete if 'ordered' is False).
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque() if ordered else set()
+
+        for line in lines:
+            if len(pending) >= max_in_flight:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            future = pool.submit(run_job, line)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+
+        if ordered:
+            while pending:
+                yield pending.popleft().result()
+        else:
+            for future in concurrent.futures.as_completed(pending):
+                yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run JSON-lines calculus jobs on a process pool.")
+    parser.add_argument("input", nargs="?", default="-", help="JSON-lines job file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="where to write the result lines (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 0 runs the jobs in this process)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="maximum number of submitted, unfinished jobs (default: 4 x workers)")
+    parser.add_argument("--unordered", action="store_true", help="write results as soon as they are ready")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+
+    try:
+        if args.workers == 0:
+            results = run_serial(jobs(source))
+        else:
+            workers = args.workers or os.cpu_count() or 1
+            results = run_pool(jobs(source), workers, args.max_in_flight or 4 * workers, not args.unordered)
+
+        for result in results:
+            sink.write(result + "\n")
+            sink.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+'''
+  Byimaan
+  - Subhpreet Singh (https://github.com/SubhPB/)
+
+  Local evaluation service. Serves the jobs of main.py, one JSON object per line, over a TCP socket:
+
+      python server.py --port 8765 --workers 4
+      echo '{"id": 1, "op": "gradient", "expression": "x*y", "point": {"x": 1, "y": 2, "z": 0}}' | nc localhost 8765
+
+  Results come back one line per request as they finish, matched by "id". Identical concurrent requests are
+  computed once, and single-point "gradient" and "directional_derivative" requests on the same expression that
+  arrive within the batch window are evaluated together as one numeric batch, answering exactly as the jobs run
+  on their own would (up to floating point rounding). A connection has at most --max-in-flight unanswered
+  requests, further lines are read as answers go out. {"op": "metrics"} returns the request counters, latency
+  percentiles and queue depths.
+'''
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import multiprocessing
+import sys
+import time
+
+from main import OPERATIONS, parse_direction, parse_expression, parse_point, run_job, to_json
+
+# Ops whose single-point requests are gathered into numeric batches
+BATCHED = ("gradient", "directional_derivative")
+
+
+def run_batch(op, expression, jobs):
+    """
+    Evaluate single-point jobs of one op on one expression as one numeric batch (in a worker process).
+    Returns one result line per job. Jobs the batch cannot answer as run_job would (a non-finite value, where
+    run_job gives zoo or a complex number, or a direction without length) are run on their own, and so is every
+    job if the batch cannot be evaluated numerically at all.
+    """
+    try:
+        import numpy as np
+        from Algorithms import DirectionalDerivative, FusedEvaluator
+
+        symbolic = parse_expression(expression)
+        evaluator = FusedEvaluator.of(symbolic)
+        points = np.concatenate([evaluator.point_array(parse_point(job["point"]), symbolic) for job in jobs])
+        with np.errstate(all="ignore"):
+            gradient = evaluator(points)["gradient"]
+
+        if op == "gradient":
+            values = gradient
+        else:
+            units = np.full((len(jobs), 3), np.nan)
+            for i, job in enumerate(jobs):
+                try:
+                    units[i] = DirectionalDerivative.directions([parse_direction(job)])[0]
+                except (ValueError, TypeError):
+                    pass
+            with np.errstate(all="ignore"):
+                values = np.einsum('ij,ij->i', gradient, units)
+    except Exception:
+        return [run_job(json.dumps(job)) for job in jobs]
+
+    finite = np.all(np.isfinite(np.reshape(values, (len(jobs), -1))), axis=1)
+    return [json.dumps({"id": job.get("id"), "ok": True, "result": to_json(value)}) if ok else run_job(json.dumps(job))
+            for job, value, ok in zip(jobs, values, finite)]
+
+
+class Metrics:
+    """
+    Request counters and a window of recent latencies.
+    """
+    def __init__(self, window=4096):
+        self.started = time.monotonic()
+        self.requests = collections.Counter()
+        self.errors = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies = collections.deque(maxlen=window)
+
+    def observe(self, op, seconds, ok):
+        self.requests[op] += 1
+        self.errors += not ok
+        self.latencies.append(seconds)
+
+    def snapshot(self, **gauges):
+        """
+        Return the counters, the latency percentiles in milliseconds over the recent window and the given gauges.
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            return 1000 * latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+
+        return {"uptime": time.monotonic() - self.started, "requests": dict(self.requests),
+                "errors": self.errors, "coalesced": self.coalesced, "batches": self.batches, "batched": self.batched,
+                "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99),
+                               "max": 1000 * latencies[-1] if latencies else None},
+                **gauges}
+
+
+class EvaluationServer:
+    """
+    This class answers JSON-lines jobs on a socket, offloading the CPU-bound work to a process pool. The workers
+    keep their derivative and compiled-kernel caches between requests.
+    """
+    def __init__(self, workers=None, batch_window=0.002, max_batch=1024, max_in_flight=256):
+        """
+        Initialize with the number of worker processes (0 runs the jobs on one thread of this process), how long
+        (seconds) single-point requests wait to be batched, the largest batch, and how many unanswered requests
+        one connection may have.
+        """
+        # Workers are started from a fork server: forked straight from this process they would inherit the open
+        # client sockets, and a closed connection would not reach the client while a worker holds a copy of it
+        context = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+        self.pool = (concurrent.futures.ThreadPoolExecutor(max_workers=1) if workers == 0
+                     else concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context))
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.metrics = Metrics()
+        self.inflight = {}   # canonical job without id -> task computing it
+        self.pending = {}    # (op, expression) -> [(job, future)] waiting for the batch window
+        self.timers = {}
+        self.offloaded = 0
+
+    async def offload(self, function, *args):
+        # Run in the pool, counting the submitted and unfinished calls
+        self.offloaded += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+        finally:
+            self.offloaded -= 1
+
+    async def compute(self, job):
+        """
+        Compute one job (without its id) and return the result as a dict.
+        """
+        if job.get("op") in BATCHED and "point" in job and "expression" in job:
+            future = asyncio.get_running_loop().create_future()
+            key = (job["op"], job["expression"])
+            batch = self.pending.setdefault(key, [])
+            batch.append((job, future))
+
+            if len(batch) >= self.max_batch:
+                self.flush(key)
+            elif len(batch) == 1:
+                self.timers[key] = asyncio.get_running_loop().call_later(self.batch_window, self.flush, key)
+            return await future
+
+        return json.loads(await self.offload(run_job, json.dumps(job)))
+
+    def flush(self, key):
+        # Send the jobs gathered for (op, expression) to the pool as one batch
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.pending.pop(key, None)
+        if batch:
+            self.metrics.batches += 1
+            self.metrics.batched += len(batch)
+            asyncio.ensure_future(self.run_batch(key, batch))
+
+    async def run_batch(self, key, batch):
+        try:
+            lines = await self.offload(run_batch, key[0], key[1], [job for job, _ in batch])
+            for (_, future), line in zip(batch, lines):
+                future.set_result(json.loads(line))
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+
+    async def evaluate(self, line):
+        """
+        Answer one request line, coalescing it with an identical request that is already being computed.
+        """
+        try:
+            job = json.loads(line)
+        except ValueError as exc:
+            return {"id": None, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        if job.get("op") == "metrics":
+            return {"id": job.get("id"), "ok": True, "result": self.metrics.snapshot(
+                in_flight=len(self.inflight), batch_queue=sum(map(len, self.pending.values())), pool_queue=self.offloaded)}
+
+        if job.get("op") not in OPERATIONS:
+            return json.loads(run_job(line))
+
+        body = {k: v for k, v in job.items() if k != "id"}
+        key = json.dumps(body, sort_keys=True)
+        task = self.inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self.compute(body))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.metrics.coalesced += 1
+
+        # Shielded, a client going away must not cancel a computation other clients wait for
+        result = dict(await asyncio.shield(task))
+        result["id"] = job.get("id")
+        return result
+
+    async def respond(self, line, writer):
+        started = time.perf_counter()
+        try:
+            result = await self.evaluate(line)
+        except Exception as exc:
+            result = {"id": None, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        self.metrics.observe(_op_of(line), time.perf_counter() - started, result.get("ok", False))
+        writer.write((json.dumps(result) + "\n").encode())
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        """
+        Serve one connection, requests on it are answered concurrently and in completion order. At most
+        'max_in_flight' of them are unanswered, the next line is only read when one of those is answered.
+        """
+        tasks = set()
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        def done(task):
+            tasks.discard(task)
+            slots.release()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    await slots.acquire()
+                    task = asyncio.ensure_future(self.respond(line.decode(), writer))
+                    tasks.add(task)
+                    task.add_done_callback(done)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """
+        Listen on host:port until cancelled.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def _op_of(line):
+    # The op named by a request line, for the per-op counters
+    try:
+        return str(json.loads(line).get("op"))
+    except (ValueError, AttributeError):
+        return "invalid"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve calculus jobs as JSON lines over TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 0 runs the jobs in this process)")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="milliseconds single-point requests wait to be batched (default: 2)")
+    parser.add_argument("--max-in-flight", type=int, default=256,
+                        help="maximum number of unanswered requests per connection (default: 256)")
+    args = parser.parse_args(argv)
+
+    server = EvaluationServer(args.workers, args.batch_window / 1000, max_in_flight=args.max_in_flight)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
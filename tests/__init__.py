@@ -0,0 +1,4 @@
+'''
+  Tests for the Algorithms package.
+  Run with: python -m pytest -q
+'''
@@ -0,0 +1,59 @@
+'''
+  Forward mode AD against sympy.diff.
+'''
+
+import numpy as np
+import pytest
+import sympy
+
+from Algorithms import Differentiation
+
+# Real, so that sympy differentiates Abs to sign
+x, y, z = sympy.symbols("x y z", real=True)
+
+EXPRESSIONS = [
+    x**3 * y - 2 * x * y**2 * z + 7,
+    sympy.sin(x * y) * sympy.exp(z) + sympy.cos(x + z),
+    sympy.log(x**2 + y**2 + 1) / (1 + z**2),
+    sympy.sqrt(x**2 + y**2 + z**2) + x**sympy.Rational(5, 2),
+    sympy.tan(x / 3) + sympy.tanh(y * z) + sympy.sinh(x) * sympy.cosh(y),
+    sympy.atan(x * y) + sympy.asin(z / 2) - sympy.acos(x / 3),
+    sympy.asinh(x + y) + sympy.atanh(z / 2) + sympy.acosh(2 + x**2),
+    sympy.Abs(x - y) * z + 2**(x * z) + x**y,
+]
+
+# Points away from the kinks and branch points of the expressions above
+POINTS = {"x": np.array([0.3, 0.7, 1.2]), "y": np.array([-0.4, 0.9, 0.5]), "z": np.array([0.8, -0.6, 0.1])}
+
+ORDERS = [[x], [y], [z], [x, x], [x, y], [y, z], [x, x, x], [x, y, z], [z, z, y]]
+
+
+def symbolic(expression, symbols):
+    # sympy.diff evaluated at every point of POINTS
+    # DiracDelta from differentiating Abs twice vanishes at the points, which stay off the kink
+    derivative = sympy.diff(expression, *symbols).replace(sympy.DiracDelta, lambda *args: 0)
+    function = sympy.lambdify((x, y, z), derivative, "numpy")
+    return np.broadcast_to(function(POINTS["x"], POINTS["y"], POINTS["z"]), POINTS["x"].shape)
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS, ids=str)
+@pytest.mark.parametrize("symbols", ORDERS, ids=lambda s: "".join(map(str, s)))
+def test_ad_matches_sympy(expression, symbols):
+    ad = Differentiation(expression, x).mixed_partial_differentiation(symbols, backend="ad", values=POINTS)
+    np.testing.assert_allclose(ad, symbolic(expression, symbols), rtol=1e-9, atol=1e-9)
+
+
+def test_nth_derivative_matches_sympy():
+    expression = sympy.atan(x) * sympy.exp(-x)
+    ad = Differentiation(expression, x).nth_differentiation(4, backend="ad", values={"x": POINTS["x"]})
+    np.testing.assert_allclose(ad, sympy.lambdify(x, sympy.diff(expression, x, 4))(POINTS["x"]), rtol=1e-9)
+
+
+def test_ad_validates_symbols():
+    with pytest.raises(TypeError):
+        Differentiation(x * y, x).mixed_partial_differentiation(["x", 1], backend="ad", values=POINTS)
+
+
+def test_unsupported_function_names_it():
+    with pytest.raises(ValueError, match="besselj"):
+        Differentiation(sympy.besselj(x, y), y).differentiate(POINTS, backend="ad")
@@ -0,0 +1,50 @@
+'''
+  Adaptive Gauss-Kronrod cubature (method="numeric") of MultivariableIntegration against closed forms.
+'''
+
+import math
+
+import pytest
+import sympy as sy
+from sympy.abc import x, y, z
+
+from Algorithms import AdaptiveCubature, CompiledRegion, MultivariableIntegration
+
+
+def numeric(expression, limit, **options):
+    return MultivariableIntegration().solve_multiple_integral(expression, limit, method="numeric", **options)
+
+
+def test_polynomial_over_a_box_is_exact():
+    result = numeric(x**2 * y + z, [{"x": {"a": 0, "b": 3}}, {"y": {"a": -1, "b": 2}}, {"z": {"a": 0, "b": 1}}])
+    assert result["converged"]
+    assert result["value"] == pytest.approx(9 * 1.5 + 3 * 3 * 0.5, rel=1e-12)
+
+
+def test_inner_limits_depending_on_outer_variables():
+    # Triangle 0 <= x <= y <= 1
+    result = numeric(x * y, [{"x": {"a": 0, "b": y}}, {"y": {"a": 0, "b": 1}}])
+    assert result["value"] == pytest.approx(1 / 8, rel=1e-10)
+
+
+def test_oscillatory_integrand_meets_the_tolerance():
+    result = numeric(sy.cos(10 * x * y), [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": 1}}], rel_tol=1e-9)
+    # The inner integral is sin(10 y) / (10 y), the outer one Si(10) / 10
+    exact = float(sy.Si(10) / 10)
+    assert result["converged"]
+    assert result["value"] == pytest.approx(exact, rel=1e-8)
+    assert result["error"] <= 1e-9 * abs(result["value"])
+
+
+def test_evaluation_budget_stops_unconverged():
+    # The kink of |x - y| keeps the error estimate up, a tiny budget cannot converge
+    region = CompiledRegion(sy.Abs(x - y), [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": 1}}])
+    result = AdaptiveCubature(region, rel_tol=1e-14, max_evaluations=2000)()
+    assert not result["converged"]
+    assert result["value"] == pytest.approx(1 / 3, rel=1e-2)
+
+
+def test_gaussian_over_three_dimensions():
+    limit = [{"x": {"a": -3, "b": 3}}, {"y": {"a": -3, "b": 3}}, {"z": {"a": -3, "b": 3}}]
+    result = numeric(sy.exp(-(x**2 + y**2 + z**2)), limit, rel_tol=1e-10)
+    assert result["value"] == pytest.approx((math.sqrt(math.pi) * math.erf(3)) ** 3, rel=1e-9)
@@ -0,0 +1,47 @@
+'''
+  Multi-start Newton (NewtonSolver) behind the numeric paths of EquationSolver and FindCriticalPoints.
+'''
+
+import numpy as np
+import sympy
+from sympy import Eq
+from sympy.abc import x, y
+
+from Algorithms import EquationSolver, FindCriticalPoints
+from Algorithms.Equations import Equation, NewtonSolver
+
+
+def test_degenerate_minimum_is_one_root():
+    # The residual of x**4 + y**4 falls below tolerance long before Newton reaches the origin
+    points = FindCriticalPoints(x**4 + y**4)(method="numeric", seeds=200, seed=0)
+    assert len(points) == 1
+    assert abs(points[0][x]) < 1e-6 and abs(points[0][y]) < 1e-6
+
+
+def test_non_isolated_critical_set_is_reported_once():
+    # Every point of the line x = 0 is critical
+    points = FindCriticalPoints(3 * x * sympy.sin(x * y))(method="numeric", seeds=200, seed=0)
+    assert len(points) == 1
+    assert abs(points[0][x]) < 1e-6
+
+
+def test_isolated_roots_are_all_found():
+    points = FindCriticalPoints(x**3 - 3 * x + y**2)(method="numeric", seeds=200, seed=0)
+    assert [(round(p[x], 8), round(p[y], 8)) for p in points] == [(-1, 0), (1, 0)]
+
+
+def test_converged_roots_satisfy_the_system():
+    system = [sympy.sin(x) - y / 2, x**2 + y**2 - 4]
+    solver = NewtonSolver(system, [x, y])
+    roots = solver(solver.seeds([(-3, 3), (-3, 3)], 500, seed=1))
+    assert len(roots) == 2
+    residual = [[float(e.subs({x: a, y: b})) for e in system] for a, b in roots]
+    assert np.max(np.abs(residual)) < 1e-9
+
+
+def test_numeric_roots_stay_inside_bounds():
+    # sin(x) = 0 has roots everywhere, Newton from seeds near the box edge escapes it
+    solver = EquationSolver([Equation(Eq(sympy.sin(x), 0))], [x])
+    roots = solver.numeric(bounds={"x": (-4, 4)}, seeds=300, seed=0)
+    values = sorted(root[x] for root in roots)
+    assert np.allclose(values, [-np.pi, 0, np.pi])
@@ -0,0 +1,70 @@
+'''
+  Integration order planning and partial result reuse of MultivariableIntegration.
+'''
+
+import pytest
+import sympy as sy
+from sympy.abc import x, y, z
+
+from Algorithms import IntegrationPlanner, MultivariableIntegration, partial_integral_cache
+
+
+def planned(expression, limit):
+    # Variables of the planned order, innermost first
+    return [v for v, _ in IntegrationPlanner(limit)(expression)]
+
+
+def test_planner_reorders_to_avoid_integration_by_parts():
+    # Given x innermost, with respect to y first the x cancels
+    limit = [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": sy.pi / 2}}]
+    assert planned(x * sy.cos(x * y), limit) == [y, x]
+
+    limit = [{"y": {"a": 0, "b": 1}}, {"x": {"a": 0, "b": 1}}]
+    assert planned(y**2 * sy.exp(x * y), limit) == [x, y]
+
+
+def test_planner_keeps_the_given_order_on_ties():
+    limit = [{"z": {"a": 0, "b": 1}}, {"x": {"a": 0, "b": 2}}, {"y": {"a": -1, "b": 1}}]
+    assert planned(x**2 + sy.sin(y) / 2 + z * 2, limit) == [z, x, y]
+
+
+def test_planner_respects_variable_limits():
+    # x runs from y to 1, so x has to be integrated before y whatever the integrand
+    assert planned(sy.exp(x**2), [{"x": {"a": y, "b": 1}}, {"y": {"a": 0, "b": 1}}]) == [x, y]
+    assert planned(y * x, [{"y": {"a": 0, "b": 1}}, {"x": {"a": y, "b": 1}}]) == [x, y]
+
+
+def test_planned_and_given_orders_agree():
+    solve = MultivariableIntegration()
+    limit = [{"x": {"a": 0, "b": 2}}, {"y": {"a": 0, "b": 3}}, {"z": {"a": 0, "b": 1}}]
+    expression = x**2 * y + sy.sin(z) * x
+
+    assert sy.simplify(solve.solve_multiple_integral(expression, limit, order="plan")
+                       - solve.solve_multiple_integral(expression, limit)) == 0
+    assert sy.simplify(solve.solve_multiple_integral(x * sy.cos(x * y), [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": sy.pi / 2}}],
+                                                     order="plan") - 2 / sy.pi) == 0
+
+
+def test_auto_falls_back_on_non_finite_answers():
+    # In the given order sympy evaluates the inner antiderivative of x*exp(x*y) to nan at y = 0
+    limit = [{"x": {"a": 0, "b": 1}}, {"y": {"a": 0, "b": 2}}]
+    solve = MultivariableIntegration()
+    assert solve.solve_multiple_integral(x * sy.exp(x * y), limit) is sy.nan
+    result = solve.solve_multiple_integral(x * sy.exp(x * y), limit, method="auto")
+    assert isinstance(result, dict) and abs(result["value"] - float(sy.exp(2) / 2 - sy.Rational(3, 2))) < 1e-8
+    assert solve.solve_multiple_integral(x * sy.exp(x * y), limit, method="auto", order="plan") == sy.exp(2) / 2 - sy.Rational(3, 2)
+
+
+def test_inner_layers_are_reused_when_outer_limits_change():
+    solve = MultivariableIntegration()
+    partial_integral_cache.clear()
+    for b in (1, 2, 3):
+        assert solve.solve_multiple_integral(x * y**2, [{"x": {"a": 0, "b": y}}, {"y": {"a": 0, "b": b}}]) == sy.Rational(b**5, 10)
+
+    stats = partial_integral_cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 4
+
+
+def test_unknown_order_is_rejected():
+    with pytest.raises(ValueError):
+        MultivariableIntegration().solve_multiple_integral(x, [{"x": {"a": 0, "b": 1}}], order="fastest")
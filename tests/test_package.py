@@ -0,0 +1,51 @@
+'''
+  Package API and lazy imports of the Algorithms package, every check runs in a fresh interpreter.
+  Import times are budgeted by the "import" benchmark, not here, wall-clock limits are too noisy for a test.
+'''
+
+import subprocess
+import sys
+
+from benchmarks.bench_algorithms import ROOT
+
+
+def run(code):
+    # Run 'code' in a fresh interpreter from the repository root and return its stdout
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert output.returncode == 0, output.stderr
+    return output.stdout.strip()
+
+
+def test_bare_import_loads_no_submodule():
+    assert run("import sys, Algorithms; print(sorted(m for m in sys.modules if m.startswith(('Algorithms.', 'sympy', 'numpy', 'scipy'))))") == "[]"
+
+
+def test_export_loads_only_what_it_needs():
+    code = "import sys; from Algorithms import FindGradient; print(sorted(m for m in sys.modules if m.startswith(('Algorithms.', 'scipy'))))"
+    loaded = run(code)
+    assert "Algorithms.Vector_tools" in loaded
+    assert not any(name in loaded for name in ("Multivarible_Integration", "Optimization", "Streaming", "scipy"))
+
+
+def test_every_export_resolves():
+    assert run("import Algorithms; [getattr(Algorithms, name) for name in Algorithms.__all__]; print('ok')") == "ok"
+
+
+def test_submodules_stay_modules_after_lazy_exports():
+    code = """
+import Algorithms
+Algorithms.FindGradient
+import Algorithms.Derivatives as D
+from Algorithms.Derivatives import Differentiation
+print(D.HessianTest.__name__, D.__name__, Differentiation is Algorithms.Differentiation)
+"""
+    assert run(code) == "HessianTest Algorithms.Derivatives True"
+
+
+def test_submodule_import_before_package_name():
+    code = """
+import Algorithms.Vector_tools
+from Algorithms import Differentiation, FindGradient
+print(Differentiation.__name__, Differentiation.__module__, FindGradient.__module__)
+"""
+    assert run(code) == "Differentiation Algorithms.Derivatives Algorithms.Vector_tools"
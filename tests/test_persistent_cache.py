@@ -0,0 +1,31 @@
+'''
+  The SQLite backed PersistentCache: round trips and size-bounded eviction.
+'''
+
+import sympy
+from sympy.abc import x, y
+
+from Algorithms import PersistentCache
+
+
+def test_round_trip(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.sqlite"))
+    cache.store("integrate", x * y, x, value=x**2 * y / 2)
+    assert cache.lookup("integrate", x * y, x) == x**2 * y / 2
+    assert cache.memoize("integrate", lambda: 1 / 0, x * y, x) == x**2 * y / 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_size_stays_bounded_without_scanning_on_every_store(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.sqlite"), max_bytes=64 * 1024)
+    checks = []
+    evict = cache.evict
+    cache.evict = lambda: (checks.append(1), evict())
+
+    for k in range(2000):
+        cache.store("diff", sympy.Integer(k), value="v" * 200)
+
+    assert cache.stats()["bytes"] <= 64 * 1024
+    assert len(checks) < 200
+    # The most recent entries survive eviction
+    assert cache.lookup("diff", sympy.Integer(1999)) == "v" * 200
@@ -0,0 +1,65 @@
+'''
+  Randomized quasi-Monte Carlo integration (method="qmc") in higher dimensions.
+'''
+
+import math
+
+import pytest
+import sympy as sy
+
+from Algorithms import MultivariableIntegration, QuasiMonteCarloIntegration
+
+U = sy.symbols("u0:6")
+BOX = [{str(u): {"a": 0, "b": 1}} for u in U]
+# Integral of exp(-|u|^2) over the unit 6-cube
+GAUSSIAN = (math.sqrt(math.pi) / 2 * math.erf(1)) ** 6
+
+
+def test_converges_to_the_closed_form():
+    result = QuasiMonteCarloIntegration(sy.exp(-sum(u**2 for u in U)), BOX, rel_tol=1e-4, seed=0)()
+    assert result["converged"]
+    assert result["value"] == pytest.approx(GAUSSIAN, rel=5e-4)
+    # The confidence interval is honest, give it some slack so the test does not depend on the seed
+    assert abs(result["value"] - GAUSSIAN) <= 3 * result["error"]
+
+
+def test_same_seed_same_estimate():
+    first = QuasiMonteCarloIntegration(sum(U), BOX, max_samples=100_000, seed=3)()
+    second = QuasiMonteCarloIntegration(sum(U), BOX, max_samples=100_000, seed=3)()
+    assert first == second
+
+
+def test_stream_error_shrinks_and_samples_grow():
+    stream = QuasiMonteCarloIntegration(sy.exp(-sum(u**2 for u in U)), BOX, chunk_size=1024, seed=1).stream()
+    estimates = [next(stream) for _ in range(16)]
+    assert [e["samples"] for e in estimates] == [16 * 1024 * (k + 1) for k in range(16)]
+    assert estimates[-1]["error"] < estimates[0]["error"]
+
+
+def test_halton_beats_random_points():
+    errors = {}
+    for sequence in ("halton", "random"):
+        stream = QuasiMonteCarloIntegration(sy.exp(-sum(u**2 for u in U)), BOX, sequence=sequence, seed=2).stream()
+        for _, estimate in zip(range(8), stream):
+            pass
+        errors[sequence] = estimate["error"]
+    assert errors["halton"] < errors["random"]
+
+
+def test_sample_budget_stops_unconverged():
+    result = QuasiMonteCarloIntegration(sy.exp(-sum(u**2 for u in U)), BOX, rel_tol=1e-12, chunk_size=256,
+                                        max_samples=16 * 1024, seed=0)()
+    assert not result["converged"] and result["samples"] == 16 * 1024
+
+
+def test_variable_limits_through_solve_multiple_integral():
+    # Triangle 0 <= x <= y <= 1
+    x, y = sy.symbols("x y")
+    result = MultivariableIntegration().solve_multiple_integral(x * y, [{"x": {"a": 0, "b": y}}, {"y": {"a": 0, "b": 1}}],
+                                                                method="qmc", rel_tol=1e-4, seed=0)
+    assert result["value"] == pytest.approx(1 / 8, rel=1e-3)
+
+
+def test_needs_two_replicates():
+    with pytest.raises(ValueError):
+        QuasiMonteCarloIntegration(sum(U), BOX, replicates=1)
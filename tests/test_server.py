@@ -0,0 +1,85 @@
+'''
+  The evaluation server: numeric batches against run_job, the per-connection limit and expression parsing.
+'''
+
+import asyncio
+import json
+
+import pytest
+
+from main import parse_expression, run_job
+from server import EvaluationServer, run_batch
+
+POINT = {"x": 1, "y": 2, "z": 3}
+
+BATCHES = [
+    ("gradient", "3*x*sin(x*y)", [{"point": {"x": 4, "y": 1, "z": 0}}, {"point": {"x": "pi/2", "y": "1/3", "z": 0}},
+                                  {"point": {"x": 1, "y": 2}}]),
+    ("gradient", "1/x + sqrt(y)", [{"point": {"x": 0, "y": 2, "z": 0}}, {"point": {"x": 1, "y": -1, "z": 0}},
+                                   {"point": {"x": 2, "y": 4, "z": 0}}]),
+    ("directional_derivative", "x**2*y + z", [
+        {"point": POINT}, {"point": POINT, "angle": "pi/4"}, {"point": POINT, "angle": 0, "vector": [0, 1, 0]},
+        {"point": POINT, "angle": "pi/3", "vector": [0, 0, 1]}, {"point": POINT, "vector": ["1/2", "sqrt(3)/2"]},
+        {"point": POINT, "vector": [1, 2, 2]}, {"point": POINT, "vector": [0, 0, 0]}]),
+]
+
+
+def same(a, b):
+    # Equal results, floats up to rounding: the batch evaluates numerically, run_job symbolically
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same(u, v) for u, v in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        return a == pytest.approx(b, rel=1e-12, abs=1e-12)
+    return a == b
+
+
+@pytest.mark.parametrize("op, expression, extras", BATCHES, ids=lambda v: v if isinstance(v, str) else None)
+def test_batch_answers_as_run_job(op, expression, extras):
+    jobs = [dict(extra, id=i, op=op, expression=expression) for i, extra in enumerate(extras)]
+    batched = [json.loads(line) for line in run_batch(op, expression, jobs)]
+    single = [json.loads(run_job(json.dumps(job))) for job in jobs]
+    for a, b in zip(batched, single):
+        assert a.keys() == b.keys() and a["id"] == b["id"] and a["ok"] == b["ok"]
+        assert same(a.get("result"), b.get("result")), (a, b)
+
+
+def test_connection_in_flight_is_limited():
+    server = EvaluationServer(workers=0, max_in_flight=3)
+    state = {"now": 0, "peak": 0}
+
+    async def respond(line, writer):
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+        writer.write(line.encode())
+        await writer.drain()
+
+    server.respond = respond
+
+    async def scenario():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        writer.write(b"".join(b'{"id": %d}\n' % i for i in range(20)))
+        writer.write_eof()
+        answers = [line async for line in reader]
+        listener.close()
+        return answers
+
+    try:
+        answers = asyncio.run(scenario())
+    finally:
+        server.pool.shutdown()
+    assert len(answers) == 20
+    assert state["peak"] == 3
+
+
+@pytest.mark.parametrize("text", ["().__class__", "__import__('os')", "lambda: 1", "[x]", "x.real", "a = 1", "'x'"])
+def test_parse_expression_rejects_code(text):
+    with pytest.raises(ValueError):
+        parse_expression(text)
+
+
+def test_parse_expression_reads_sympy_syntax():
+    assert str(parse_expression("3*x*sin(x*y) + ln(y)^2")) == "3*x*sin(x*y) + log(y)**2"
+    assert float(parse_expression("sqrt(3)/2")) == pytest.approx(3 ** 0.5 / 2)
@@ -0,0 +1,86 @@
+'''
+  Out-of-core gradient fields (GradientFieldStream): results, interruption and resume.
+'''
+
+import os
+
+import numpy as np
+import pytest
+from sympy.abc import x, y, z
+
+from Algorithms import Streaming
+from Algorithms.Streaming import GradientFieldStream
+
+EXPRESSION = x**2 * y + z**3
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "points.npy")
+    np.save(path, np.random.default_rng(0).uniform(-1, 1, size=(1000, 3)))
+    return path
+
+
+def expected(path):
+    p = np.load(path)
+    return np.stack([2 * p[:, 0] * p[:, 1], p[:, 0] ** 2, 3 * p[:, 2] ** 2], axis=1)
+
+
+def test_gradient_and_norm(source, tmp_path):
+    gradient = GradientFieldStream(EXPRESSION, chunk_size=128)(source, str(tmp_path / "g.npy"))
+    np.testing.assert_allclose(gradient, expected(source), rtol=1e-12)
+    norm = GradientFieldStream(EXPRESSION, "norm", chunk_size=128)(source, str(tmp_path / "n.npy"))
+    np.testing.assert_allclose(norm, np.linalg.norm(expected(source), axis=1), rtol=1e-12)
+    assert not os.path.exists(str(tmp_path / "g.npy") + ".progress.json")
+
+
+def test_interrupted_run_resumes_the_missing_chunks(source, tmp_path, monkeypatch):
+    target = str(tmp_path / "g.npy")
+    stream = GradientFieldStream(EXPRESSION, chunk_size=100)
+
+    def stop_after_three(done, total):
+        if done >= 300:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        stream(source, target, progress=stop_after_three)
+    assert os.path.exists(target + ".progress.json")
+
+    run = Streaming._run_chunk
+    started = []
+    monkeypatch.setattr(Streaming, "_run_chunk", lambda *args: (started.append(args[-2]), run(*args))[1])
+    result = stream(source, target)
+
+    assert started == list(range(300, 1000, 100))
+    np.testing.assert_allclose(result, expected(source), rtol=1e-12)
+    assert not os.path.exists(target + ".progress.json")
+
+
+def test_changed_run_starts_over(source, tmp_path, monkeypatch):
+    target = str(tmp_path / "g.npy")
+
+    def stop_at_once(done, total):
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        GradientFieldStream(EXPRESSION, chunk_size=100)(source, target, progress=stop_at_once)
+
+    # Another expression has another fingerprint, nothing of the interrupted run is reused
+    run = Streaming._run_chunk
+    started = []
+    monkeypatch.setattr(Streaming, "_run_chunk", lambda *args: (started.append(args[-2]), run(*args))[1])
+    result = GradientFieldStream(x + y + z, chunk_size=100)(source, target)
+
+    assert started == list(range(0, 1000, 100))
+    np.testing.assert_allclose(result, np.ones((1000, 3)))
+
+
+def test_workers_match_serial(source, tmp_path):
+    serial = GradientFieldStream(EXPRESSION, "unit_normal", chunk_size=256)(source, str(tmp_path / "a.npy"))
+    parallel = GradientFieldStream(EXPRESSION, "unit_normal", chunk_size=256)(source, str(tmp_path / "b.npy"), workers=2)
+    np.testing.assert_allclose(parallel, serial)
+    np.testing.assert_allclose(np.linalg.norm(serial, axis=1), 1)
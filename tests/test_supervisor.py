@@ -0,0 +1,44 @@
+'''
+  Supervised symbolic work: start methods, picklability and how callers report a timeout.
+'''
+
+import pytest
+import sympy
+from sympy.abc import x, y
+
+from Algorithms import Equation, EquationSolver, MultivariableIntegration, Persistent_cache, SupervisionError, supervise
+from Algorithms.Profiling import solve
+
+# Solving this one symbolically does not finish in any reasonable time
+HARD = [Equation(sympy.Eq(sympy.sin(x) + y**3, 1)), Equation(sympy.Eq(sympy.exp(x * y) - x, 2))]
+
+
+def test_spawned_worker_runs_profiled_primitive():
+    result = supervise(solve, [x**2 - 4], [x], time_limit=60, start_method="spawn")
+    assert result["status"] == "ok"
+    assert sorted(result["value"]) == [(-2,), (2,)]
+
+
+def test_spawned_worker_runs_bound_method():
+    result = supervise(MultivariableIntegration().get_integration, x * y, x, time_limit=60, start_method="spawn")
+    assert result["status"] == "ok" and result["value"] == x**2 * y / 2
+
+
+def test_unpicklable_function_is_rejected_before_spawning():
+    with pytest.raises(TypeError, match="picklable"):
+        supervise(lambda: 1, start_method="spawn")
+
+
+def test_solver_timeout_raises():
+    with Persistent_cache.disabled():
+        with pytest.raises(SupervisionError) as info:
+            EquationSolver(HARD)(time_limit=0.5)
+    assert info.value.status == "timeout"
+
+
+def test_solver_timeout_falls_back_to_numeric_roots():
+    with Persistent_cache.disabled():
+        roots = EquationSolver(HARD)(time_limit=0.5, fallback="numeric", bounds={"x": (-3, 3), "y": (-3, 3)}, seed=0)
+    assert isinstance(roots, list) and roots
+    for root in roots:
+        assert abs(sympy.sin(root[x]) + root[y]**3 - 1) < 1e-8
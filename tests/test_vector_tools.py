@@ -0,0 +1,37 @@
+'''
+  Gradients and normals of Vector_tools.
+'''
+
+import pytest
+import sympy
+from sympy.abc import x, y, z
+
+from Algorithms import FindGradient, FindUnitNormalVector
+
+a, b, c, d = sympy.symbols("a b c d")
+
+
+def test_find_direction_with_variables():
+    # The gradient is a SparseMatrix column when variables are given
+    gradient = FindGradient(a**2 * b + c * d, variables=[a, b, c, d])
+    assert gradient.find_direction({a: 1, b: 2, c: 3, d: 4}) == sympy.sqrt(42)
+    assert gradient.find_direction({"a": 1, "b": 2, "c": 3, "d": 4}) == sympy.sqrt(42)
+
+
+def test_find_direction_matches_between_xyz_and_variables():
+    expression = x**2 * y + sympy.sin(z)
+    point = {x: 1, y: 2, z: 0}
+    assert sympy.simplify(FindGradient(expression).find_direction(point)
+                          - FindGradient(expression, variables=[x, y, z]).find_direction(point)) == 0
+
+
+@pytest.mark.parametrize("backend", ["symbolic", "compiled"])
+def test_unit_normal_at_a_vanishing_gradient_raises(backend):
+    with pytest.raises(ValueError, match="vanishes"):
+        FindUnitNormalVector(x**2 + y**2 + z**2, {"x": 0, "y": 0, "z": 0})(backend=backend)
+
+
+@pytest.mark.parametrize("backend", ["symbolic", "compiled"])
+def test_unit_normal_of_a_sphere(backend):
+    normal = FindUnitNormalVector(x**2 + y**2 + z**2, {"x": 1, "y": 2, "z": 2})(backend=backend)
+    assert [float(c) for c in normal()] == pytest.approx([1 / 3, 2 / 3, 2 / 3])